@@ -0,0 +1,176 @@
+import argparse
+import asyncio
+import inspect
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from typing import List, Tuple, Optional, Callable, Any, Protocol
+import numpy as np
+import poker_logic
+from models import Player, GameState, GameEvent, ActionType, Card
+from fast_state import FastState
+from dealer import Dealer
+import simulation
+
+# stół na asyncio: kontrolery mają `async def decide_action`, każda decyzja ma limit czasu,
+# a po jego przekroczeniu gracz automatycznie czeka (gdy może) albo pasuje.
+# wiele stołów działa w jednej pętli zdarzeń, bez osobnego wątku na stół
+
+DEFAULT_TIMEOUT = 10.0
+
+class AsyncController(Protocol):
+    async def decide_action(self, player: Player, state: GameState, legal_actions: List[ActionType]) -> Tuple[
+        ActionType, int]: ...
+
+# zwykły (synchroniczny) kontroler jako asynchroniczny.
+# domyślnie woła kontroler od razu w pętli zdarzeń - boty liczą krótko, ale limit czasu ich nie obejmuje.
+# z executorem (blocking=True w AsyncTable) decyzja liczy się w wątku stołu, więc limit czasu działa
+# także dla wolnego bota. wątku nie da się przerwać - po przekroczeniu czasu decyzja liczy się do końca,
+# a jej wynik jest ignorowany. executor stołu ma jeden wątek, więc porzucona decyzja kończy się przed
+# następną i boty nie liczą równolegle na wspólnym cache i generatorach (powtarzalność przy seedzie)
+class SyncControllerAdapter(AsyncController):
+    def __init__(self, controller: Any, executor: Optional[ThreadPoolExecutor] = None):
+        self.controller = controller
+        self.executor = executor
+
+    async def decide_action(self, player: Player, state: GameState, legal_actions: List[ActionType]) -> Tuple[
+        ActionType, int]:
+        if self.executor is None:
+            return self.controller.decide_action(player, state, legal_actions)
+        future = asyncio.get_running_loop().run_in_executor(self.executor, self.controller.decide_action, player,
+                                                            state, legal_actions)
+        # shield - anulowanie przez wait_for nie może oznaczyć jako skończonej decyzji, która wciąż się liczy
+        return await asyncio.shield(future)
+
+def as_async(controller: Any, executor: Optional[ThreadPoolExecutor] = None) -> Any:
+    if controller is None or inspect.iscoroutinefunction(controller.decide_action):
+        return controller
+    return SyncControllerAdapter(controller, executor)
+
+def fallback_action(legal_actions: List[ActionType]) -> Tuple[ActionType, int]:
+    return (ActionType.CHECK, 0) if ActionType.CHECK in legal_actions else (ActionType.FOLD, 0)
+
+class AsyncTable:
+    def __init__(self, players: List[Player], decision_timeout: float = DEFAULT_TIMEOUT,
+                 observers: Tuple[Any, ...] = (),
+                 on_action_callback: Optional[Callable[[GameState, str], None]] = None,
+                 dealer: Optional[Dealer] = None, blocking: bool = False):
+        # blocking=True - synchroniczne kontrolery liczą w osobnym (jednym na stół) wątku, z limitem czasu
+        self.executor = ThreadPoolExecutor(max_workers=1) if blocking else None
+        self._abandoned = False  # decyzja po przekroczeniu czasu może jeszcze liczyć się w wątku
+        self.players = [replace(p, controller=as_async(p.controller, self.executor)) for p in players]
+        self.decision_timeout = decision_timeout
+        self.observers = observers
+        self.on_action_callback = on_action_callback
+        # własny generator kart - stoły w jednej pętli nie dzielą stanu losowania
+        self.dealer = dealer if dealer is not None else Dealer()
+        self.state: Optional[GameState] = None
+        self.dealer_idx = 0
+        self.hands = 0
+        self.decisions = 0
+        self.showdowns = 0
+        self.timeouts = 0
+        self.decision_seconds = 0.0
+
+    async def _decide(self, controller: Any, player: Player, state: GameState,
+                      legal: List[ActionType]) -> Tuple[ActionType, int]:
+        if controller is None:
+            return ActionType.CHECK, 0
+        if isinstance(controller, SyncControllerAdapter) and controller.executor is None:
+            # kontroler liczony w pętli zdarzeń nie oddaje sterowania, więc wait_for i tak by go nie przerwał
+            return controller.controller.decide_action(player, state, legal)
+        if self._abandoned:
+            # czekamy, aż wątek skończy porzuconą decyzję - ten czas nie wlicza się do limitu następnego gracza
+            await asyncio.get_running_loop().run_in_executor(self.executor, lambda: None)
+            self._abandoned = False
+        try:
+            return await asyncio.wait_for(controller.decide_action(player, state, legal), self.decision_timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self._abandoned = self.executor is not None
+            return fallback_action(legal)
+
+    async def _betting_round(self, fast: FastState) -> List[GameEvent]:
+        events: List[GameEvent] = []
+        steps = fast.betting_steps(events, self.on_action_callback)
+        decision = None
+        try:
+            while True:
+                i, legal = steps.send(decision)
+                start = time.perf_counter()
+                decision = await self._decide(fast.controllers[i], fast.player(i), fast.to_game_state(), legal)
+                self.decision_seconds += time.perf_counter() - start
+                self.decisions += 1
+                # po każdej decyzji oddajemy pętlę, żeby stoły przeplatały się równo
+                await asyncio.sleep(0)
+        except StopIteration:
+            pass
+        return events
+
+    # jedno rozdanie, ten sam przebieg co simulation.play_hand
+    async def play_hand(self, deck: Optional[List[Card]] = None) -> Tuple[GameState, List[GameEvent]]:
+        active_players = [p for p in self.players if p.chips > 0]
+        self.dealer_idx %= len(active_players)
+        if deck is None:
+            deck = self.dealer.deal_hand(len(active_players))
+        fast = FastState(active_players, deck=[], community_cards=[], dealer_index=self.dealer_idx,
+                         observers=self.observers)
+        fast.deal_hands(deck)
+
+        events = fast.post_blinds()
+        events += await self._betting_round(fast)
+        for n in (3, 1, 1):  # flop, turn, river
+            if fast.folded.count(False) < 2:
+                break
+            fast.reset_bets()
+            events += fast.deal_table(n)
+            events += await self._betting_round(fast)
+
+        if fast.folded.count(False) > 1:
+            self.showdowns += 1
+        state, payout_events = poker_logic.resolve_payouts(fast.to_game_state())
+        self.state = state
+        by_name = {p.name: p for p in state.players}
+        self.players = [by_name.get(p.name, p) for p in self.players]
+        self.dealer_idx += 1
+        self.hands += 1
+        return state, events + payout_events
+
+    # nowi gracze przy tym samym stole (np. nowa sesja, gdy został jeden z żetonami)
+    def reset_players(self, players: List[Player]) -> None:
+        self.players = [replace(p, controller=as_async(p.controller, self.executor)) for p in players]
+        self.dealer_idx = 0
+
+    # gra aż zostanie jeden gracz z żetonami albo skończy się limit rozdań
+    async def run(self, max_hands: Optional[int] = None) -> int:
+        while len([p for p in self.players if p.chips > 0]) > 1 and (max_hands is None or self.hands < max_hands):
+            await self.play_hand()
+            # oddajemy pętlę innym stołom między rozdaniami
+            await asyncio.sleep(0)
+        return self.hands
+
+async def run_tables(tables: List[AsyncTable], max_hands: Optional[int] = None) -> List[int]:
+    return await asyncio.gather(*(table.run(max_hands) for table in tables))
+
+def main():
+    parser = argparse.ArgumentParser(description="Stoły botów w jednej pętli asyncio")
+    parser.add_argument("--tables", type=int, default=10)
+    parser.add_argument("--players", type=int, default=6)
+    parser.add_argument("--hands", type=int, default=100, help="maks. rozdań na stół")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="limit czasu na decyzję (s)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--threads", action="store_true", help="boty w wątku stołu, z limitem czasu na decyzję")
+    args = parser.parse_args()
+
+    seed_seq = np.random.SeedSequence(args.seed)
+    tables = [AsyncTable(simulation.make_bot_players(args.players, seed_seq=s), args.timeout,
+                         dealer=Dealer.from_seed_sequence(s.spawn(1)[0]), blocking=args.threads)
+              for s in seed_seq.spawn(args.tables)]
+    start = time.perf_counter()
+    hands = asyncio.run(run_tables(tables, args.hands))
+    seconds = time.perf_counter() - start
+    print(f"Stoły: {len(tables)}, rozdania: {sum(hands)}, czas: {seconds:.2f} s")
+    print(f"Przekroczone limity czasu: {sum(t.timeouts for t in tables)}")
+
+if __name__ == "__main__":
+    main()
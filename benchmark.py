@@ -0,0 +1,228 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from typing import Dict, List, Callable, Any
+import numpy as np
+import poker_evaluator
+import poker_equity
+import poker_logic
+import simulation
+from controllers import SmartBotController
+from models import Player, GameState, HandValue, ActionType, Card
+
+# benchmarki wydajności ze stałymi seedami - wynik do JSON, porównanie z zapisanym baseline
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+DEFAULT_THRESHOLD = 0.25  # ile wolniej niż baseline uznajemy za regresję
+
+def _best_time(fn: Callable[[], Any], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def _metric(value: float, unit: str, higher_is_better: bool) -> Dict[str, Any]:
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+# ręce 7-kartowe danej kategorii - rzadkie układy budujemy wprost, resztę losujemy aż trafimy
+def hands_for_class(value: HandValue, count: int, rng: random.Random) -> List[List[int]]:
+    deck = list(range(52))
+    hands: List[List[int]] = []
+    while len(hands) < count:
+        if value == HandValue.STRAIGHT_FLUSH:
+            suit, top = rng.randrange(4), rng.randrange(5, 15)
+            base = [((r if r > 1 else 14) - 2) * 4 + suit for r in range(top - 4, top + 1)]
+        elif value == HandValue.FOUR_OF_A_KIND:
+            rank = rng.randrange(13)
+            base = [rank * 4 + s for s in range(4)]
+        else:
+            base = []
+        rest = rng.sample([c for c in deck if c not in base], 7 - len(base))
+        hand = base + rest
+        if poker_evaluator.hand_value(poker_evaluator.evaluate_ints(hand)) == value:
+            hands.append(hand)
+    return hands
+
+def bench_evaluator(hands_per_class: int) -> Dict[str, Dict[str, Any]]:
+    rng = random.Random(1)
+    poker_evaluator.build_rank_table()
+    metrics = {}
+    for value in HandValue:
+        hands = hands_for_class(value, hands_per_class, rng)
+        t = _best_time(lambda: [poker_evaluator.evaluate_ints(h) for h in hands])
+        metrics[f"evaluate.{value.name.lower()}"] = _metric(len(hands) / t, "calls/s", True)
+
+    mixed = [rng.sample(range(52), 7) for _ in range(hands_per_class * 5)]
+    cards = [[poker_evaluator.int_to_card(c) for c in h] for h in mixed]
+    t = _best_time(lambda: [poker_evaluator.evaluate(h) for h in cards])
+    metrics["evaluate.tuple_api"] = _metric(len(cards) / t, "calls/s", True)
+
+    batch = np.array(mixed, dtype=np.uint8)
+    poker_evaluator.evaluate_many(batch[:1])
+    t = _best_time(lambda: poker_evaluator.evaluate_many(batch))
+    metrics["evaluate.many"] = _metric(len(batch) / t, "hands/s", True)
+    return metrics
+
+def bench_equity(repeat: int) -> Dict[str, Dict[str, Any]]:
+    deck = poker_logic.create_deck()
+    rnd = random.Random(2)
+    metrics = {}
+    for street, board_size in (("flop", 3), ("turn", 4), ("river", 5)):
+        for opponents in (1, 2, 5, 9):
+            spots = [rnd.sample(deck, 2 + board_size) for _ in range(repeat)]
+            rng = np.random.default_rng(3)
+            t = _best_time(lambda: [poker_equity.equity(s[:2], s[2:], opponents, iterations=1000, rng=rng)
+                                    for s in spots])
+            ms = t / repeat * 1000
+            metrics[f"equity.{street}.{opponents}opp"] = _metric(ms, "ms", False)
+    return metrics
+
+# to, na co faktycznie czeka bot po flopie: SmartBotController.calculate_equity (cache + adaptacyjne equity).
+# każda sytuacja dostaje nowy cache, żeby mierzyć liczenie, a nie trafienia z poprzedniego powtórzenia
+def bench_bot_equity(repeat: int) -> Dict[str, Dict[str, Any]]:
+    deck = poker_logic.create_deck()
+    rnd = random.Random(2)
+    metrics = {}
+    for street, board_size in (("flop", 3), ("turn", 4), ("river", 5)):
+        for opponents in (1, 2, 5, 9):
+            spots = [rnd.sample(deck, 2 + board_size) for _ in range(repeat)]
+            rng = np.random.default_rng(3)
+            t = _best_time(lambda: [SmartBotController(rng=rng, cache=poker_equity.EquityCache()).calculate_equity(
+                s[:2], s[2:], iterations=1000, num_opponents=opponents) for s in spots])
+            metrics[f"calculate_equity.{street}.{opponents}opp"] = _metric(t / repeat * 1000, "ms", False)
+    return metrics
+
+# 10 graczy all-in z różnymi stawkami = 10 poziomów side potów
+def side_pot_state(rng: random.Random) -> GameState:
+    deck = poker_logic.create_deck()
+    rng.shuffle(deck)
+    players = []
+    for i in range(10):
+        bet = 100 * (i + 1)
+        players.append(Player(name=f"P{i}", chips=0, hand=tuple(deck[i * 2: i * 2 + 2]), is_all_in=True,
+                              current_bet=bet, total_bet_in_hand=bet))
+    return GameState(deck=[], players=players, community_cards=deck[20:25], pot=sum(p.total_bet_in_hand for p in players))
+
+def bench_payouts(repeat: int) -> Dict[str, Dict[str, Any]]:
+    rng = random.Random(4)
+    states = [side_pot_state(rng) for _ in range(repeat)]
+    t = _best_time(lambda: [poker_logic.resolve_payouts(s) for s in states])
+    return {"resolve_payouts.10_side_pots": _metric(t / repeat * 1e6, "us", False)}
+
+# tani, deterministyczny kontroler - mierzymy sam silnik licytacji (stan, migawki), a nie decyzje botów
+class ScriptedController:
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+
+    def decide_action(self, player: Player, state: GameState, legal_actions: List[ActionType]):
+        opponents = sum(1 for p in state.players if not p.folded and p.name != player.name)
+        r = self.rng.random()
+        if r < 0.1 and opponents > 1:
+            return ActionType.FOLD, 0
+        min_raise = state.current_bet + state.min_raise
+        if r < 0.25 and ActionType.RAISE in legal_actions and min_raise <= player.chips + player.current_bet:
+            return ActionType.RAISE, min_raise
+        return (ActionType.CHECK, 0) if ActionType.CHECK in legal_actions else (ActionType.CALL, 0)
+
+def _scripted_players(num_players: int) -> List[Player]:
+    return [Player(name=f"P{i}", chips=1000, hand=(), controller=ScriptedController(i)) for i in range(num_players)]
+
+def _streets_poker_logic(players: List[Player], deck: List[Card]) -> GameState:
+    players, deck = poker_logic.deal_hands(deck, players)
+    state, _ = poker_logic.post_blinds(GameState(deck=deck, players=players, community_cards=[]))
+    state, _ = poker_logic.run_betting_round(state, action_delay=0)
+    for n in (3, 1, 1):
+        if len([p for p in state.players if not p.folded]) < 2:
+            break
+        state, _ = poker_logic.deal_table(poker_logic.reset_bets(state), n)
+        state, _ = poker_logic.run_betting_round(state, action_delay=0)
+    return state
+
+# te same talie i ten sam skryptowy kontroler na obu ścieżkach: FastState (symulacja) i GameState z replace()
+def bench_betting(hands: int) -> Dict[str, Dict[str, Any]]:
+    metrics = {}
+    for num_players in (6, 10):
+        rng = random.Random(6)
+        decks = [poker_logic.shuffle_deck(poker_logic.create_deck(), rng) for _ in range(hands)]
+        t = _best_time(lambda: [simulation.play_streets(_scripted_players(num_players), 0, deck=d) for d in decks])
+        metrics[f"betting.fast_state.{num_players}max"] = _metric(hands / t, "hands/s", True)
+        t = _best_time(lambda: [_streets_poker_logic(_scripted_players(num_players), d) for d in decks])
+        metrics[f"betting.poker_logic.{num_players}max"] = _metric(hands / t, "hands/s", True)
+    return metrics
+
+def bench_headless(hands: int) -> Dict[str, Dict[str, Any]]:
+    result = simulation.run_simulation(hands, num_players=6, seed=5)
+    return {"headless.hands_per_second": _metric(result.hands_per_second, "hands/s", True)}
+
+def run_benchmarks(quick: bool = False) -> Dict[str, Any]:
+    scale = 1 if quick else 4
+    metrics: Dict[str, Dict[str, Any]] = {}
+    metrics.update(bench_evaluator(500 * scale))
+    metrics.update(bench_equity(5 * scale))
+    metrics.update(bench_bot_equity(5 * scale))
+    metrics.update(bench_payouts(50 * scale))
+    metrics.update(bench_betting(500 * scale))
+    metrics.update(bench_headless(50 * scale))
+    return {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(), "quick": quick,
+                 "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "metrics": metrics,
+    }
+
+# zwraca listę regresji: (nazwa, baseline, teraz, zmiana)
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD) -> List[tuple]:
+    regressions = []
+    for name, base in baseline["metrics"].items():
+        current = results["metrics"].get(name)
+        if current is None or base["value"] == 0:
+            continue
+        change = current["value"] / base["value"] - 1
+        worse = -change if base["higher_is_better"] else change
+        if worse > threshold:
+            regressions.append((name, base["value"], current["value"], change))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarki ewaluatora, equity i symulacji")
+    parser.add_argument("--out", default="benchmark_results.json")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--save-baseline", action="store_true", help="zapisz wyniki jako nowy baseline")
+    parser.add_argument("--quick", action="store_true")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.quick)
+    with open(args.out, "w") as f:
+        json.dump(results, f, indent=2)
+    for name, m in results["metrics"].items():
+        print(f"{name:40s} {m['value']:14.1f} {m['unit']}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Zapisano baseline: {args.baseline}")
+        return
+
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(f"Brak baseline ({args.baseline}) - pomijam porównanie")
+        return
+
+    if baseline["meta"].get("quick") != results["meta"]["quick"]:
+        print("Uwaga: baseline był liczony w innym trybie (--quick), wyniki mogą się różnić")
+    regressions = compare(results, baseline, args.threshold)
+    for name, base, current, change in regressions:
+        print(f"REGRESJA {name}: {base:.1f} -> {current:.1f} ({change:+.0%})")
+    if regressions:
+        sys.exit(1)
+    print("Brak regresji")
+
+if __name__ == "__main__":
+    main()
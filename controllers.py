@@ -1,8 +1,8 @@
-import random
-from typing import List, Tuple
+from typing import List, Tuple, Optional
 from models import Player, GameState, ActionType, Card
-import poker_logic
-import poker_evaluator
+import poker_equity
+import preflop_table
+import numpy as np
 
 class HumanConsoleController:
     def decide_action(self, player: Player, state: GameState, legal_actions: List[ActionType]) -> Tuple[
@@ -55,9 +55,16 @@ class HumanConsoleController:
                 print("Błąd, spróbuj ponownie.")
 
 class SmartBotController:
-    def __init__(self, aggression_factor: float = 0.5):
+    def __init__(self, aggression_factor: float = 0.5, rng: Optional[np.random.Generator] = None,
+                 equity_precision: float = poker_equity.DEFAULT_TARGET_WIDTH,
+                 cache: Optional[poker_equity.EquityCache] = None):
         # parametr agresji - jak często podbija i  blefuje
         self.aggression = aggression_factor
+        self.rng = rng if rng is not None else np.random.default_rng()
+        # szerokość przedziału ufności equity, przy której bot przestaje symulować (None = zawsze pełny budżet)
+        self.equity_precision = equity_precision
+        # cache equity wspólny dla botów jednej symulacji albo stołu, bez niego bot ma własny
+        self.cache = cache if cache is not None else poker_equity.EquityCache()
 
 
     def decide_action(self, player: Player, state: GameState, legal_actions: List[ActionType]) -> Tuple[
@@ -74,16 +81,18 @@ class SmartBotController:
         if is_preflop:
             return self.play_preflop(player, state, legal_actions, can_raise)
 
-        # bot po flopie symuluje wyniki metoda monte carlo
-        equity = self.calculate_equity(player.hand, state.community_cards, iterations=100)
+        # bot po flopie symuluje wyniki metoda monte carlo przeciwko wszystkim graczom w grze
+        num_opponents = sum(1 for p in state.players if not p.folded and p.name != player.name)
+        equity = self.calculate_equity(player.hand, state.community_cards, iterations=1000,
+                                       num_opponents=max(1, num_opponents))
 
         # mały czynnik losowy
-        final_strength = equity + random.uniform(-0.01, 0.01)
+        final_strength = equity + self.rng.uniform(-0.01, 0.01)
 
         # bot gra bardzo agresywnie jak ma bardzo mocne karty
         if final_strength > 0.90:
             if ActionType.RAISE in legal_actions and can_raise:
-                bet_amount = int(state.pot * random.uniform(0.4, 0.6))
+                bet_amount = int(state.pot * self.rng.uniform(0.4, 0.6))
                 return self.make_raise(player, state, bet_amount)
             elif ActionType.CALL in legal_actions:
                 return ActionType.CALL, 0
@@ -91,12 +100,12 @@ class SmartBotController:
         aggression_threshold = 0.80 - (self.aggression * 0.05)
 
         # rzadki blef
-        should_bluff = (state.current_bet == 0 and random.random() < (self.aggression * 0.05))
+        should_bluff = (state.current_bet == 0 and self.rng.random() < (self.aggression * 0.05))
 
         if final_strength > aggression_threshold or should_bluff:
             if ActionType.RAISE in legal_actions and can_raise:
                 # mały bet: 30-45% puli
-                bet_amount = int(state.pot * random.uniform(0.3, 0.45))
+                bet_amount = int(state.pot * self.rng.uniform(0.3, 0.45))
                 return self.make_raise(player, state, bet_amount)
 
         # czy opłaca mu się sprawdzać
@@ -118,57 +127,49 @@ class SmartBotController:
         return ActionType.FOLD, 0
 
     # metoda monte carlo - bot okresla czy oplaca mu sie wchodzić
-    def calculate_equity(self, player_hand, community_cards, iterations=50) -> float:
-        deck = poker_logic.create_deck()
-        known_cards = set(player_hand + tuple(community_cards))
-        unknown_deck = [c for c in deck if c not in known_cards]
-
-        wins = 0
-        ties = 0
-        # losuje i* razy i oblicza punkty
-        for r in range(iterations):
-            sim_deck = poker_logic.shuffle_deck(list(unknown_deck))
-            cards_needed = 5 - len(community_cards)
-            sim_community = community_cards + sim_deck[:cards_needed]
-            deck_ptr = cards_needed
-            opp_hand = tuple(sim_deck[deck_ptr: deck_ptr + 2])
-
-            my_score = poker_evaluator.evaluate(list(player_hand) + sim_community)
-            opp_score = poker_evaluator.evaluate(list(opp_hand) + sim_community)
-
-            if my_score > opp_score:
-                wins += 1
-            elif my_score == opp_score:
-                ties += 1
-
-        return (wins + (ties * 0.5)) / iterations
+    # iterations to górny budżet - symulacja kończy się wcześniej, gdy wynik jest już dość dokładny
+    def calculate_equity(self, player_hand, community_cards, iterations=1000, num_opponents=1) -> float:
+        return poker_equity.cached_equity(player_hand, community_cards, num_opponents, iterations, rng=self.rng,
+                                          cache=self.cache, target_width=self.equity_precision)
 
 
     # jak nie ma kart na stole to nie liczy prawdopodbientswa tylko patrzy na swoją rękę czy ma coś dobrego.
     def play_preflop(self, player: Player, state: GameState, legal: List[ActionType], can_raise: bool) -> Tuple[
         ActionType, int]:
         #oceniam co na rece, czy oplaca sie wchodzic
-        ranks = sorted([c.rank for c in player.hand], reverse=True)
-        high, low = ranks[0], ranks[1]
-        is_pair = (high == low)
-        suited = (player.hand[0].suit == player.hand[1].suit)
-        gap = high - low
-
-        score = 0
-        # jak ma parę to silniejsza ręka
-        if is_pair:
-            score += 50 + (high * 2)
+        num_opponents = sum(1 for p in state.players if not p.folded and p.name != player.name)
+        table_equity = preflop_table.lookup(player.hand, max(1, num_opponents))
+
+        if table_equity is not None:
+            # equity z tabeli względem "uczciwej" części puli - 1.0 to przeciętna ręka przy tym stole
+            strength = table_equity * (max(1, num_opponents) + 1)
+            is_strong = strength > 1.6
+            is_playable = strength > 1.15
         else:
-            score += high + (low * 0.5)
-        if suited: score += 10
-        if gap == 1: score += 8
-        if gap == 2: score += 4
+            # bez pliku z tabelą - stara ocena punktowa
+            ranks = sorted([c.rank for c in player.hand], reverse=True)
+            high, low = ranks[0], ranks[1]
+            is_pair = (high == low)
+            suited = (player.hand[0].suit == player.hand[1].suit)
+            gap = high - low
+
+            score = 0
+            # jak ma parę to silniejsza ręka
+            if is_pair:
+                score += 50 + (high * 2)
+            else:
+                score += high + (low * 0.5)
+            if suited: score += 10
+            if gap == 1: score += 8
+            if gap == 2: score += 4
+            is_strong = score > 50
+            is_playable = score > 30
 
         # jeśli ręka jest bardzo mocna to szansa ze podbijam przed flopem
-        if score > 50:
-            if can_raise and ActionType.RAISE in legal and random.random() < 0.60:
+        if is_strong:
+            if can_raise and ActionType.RAISE in legal and self.rng.random() < 0.60:
 
-                raise_amt = int(state.current_bet + (state.min_raise * random.uniform(1, 2)))
+                raise_amt = int(state.current_bet + (state.min_raise * self.rng.uniform(1, 2)))
                 return self.make_raise(player, state, raise_amt)
 
         # jak nie chce podbic i moge czekac to czekam
@@ -181,21 +182,21 @@ class SmartBotController:
             return ActionType.CALL, 0
 
         # jeśli mocna ale nie podbijam to wchodze
-        if score > 50:
+        if is_strong:
             return ActionType.CALL, 0
 
-        if score > 30:
+        if is_playable:
             return ActionType.CALL, 0
 
         to_call = state.current_bet - player.current_bet
         is_cheap = (to_call <= 40)
         # jak tanio to wchodze zeby zobaczyc jakie karty
         if is_cheap:
-            if random.random() < 0.9:
+            if self.rng.random() < 0.9:
                 return ActionType.CALL, 0
 
         # rzadki blef
-        if random.random() < (self.aggression * 0.05):
+        if self.rng.random() < (self.aggression * 0.05):
             return ActionType.CALL, 0
 
         return ActionType.FOLD, 0
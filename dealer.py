@@ -0,0 +1,40 @@
+import random
+from typing import List, Optional
+import numpy as np
+from models import Card
+import poker_evaluator
+
+# rozdawanie kart na indeksach 0..51 z własnym generatorem dla każdego stołu/symulacji, bez globalnego `random`.
+# talie zależą tylko od seeda; całe przebiegi (talie i decyzje botów) powtarzają się, bo boty mają własne
+# generatory i cache equity na symulację/stół (simulation.make_bot_players). w async_table decyzja przerwana
+# limitem czasu liczy się do końca przed następną, więc przebieg zależy od seeda i od tego, które decyzje
+# przekroczyły limit
+CARDS = tuple(poker_evaluator.int_to_card(c) for c in range(52))
+BOARD_CARDS = 8  # flop, turn i river razem z wypalonymi kartami
+
+class Dealer:
+    def __init__(self, seed: Optional[int] = None, rng: Optional[random.Random] = None):
+        self.rng = rng if rng is not None else random.Random(seed)
+        self._deck = list(range(52))
+
+    @classmethod
+    def from_seed_sequence(cls, seed_seq: np.random.SeedSequence) -> "Dealer":
+        return cls(int(seed_seq.generate_state(1)[0]))
+
+    # częściowy Fisher-Yates: losujemy tylko `count` pierwszych pozycji.
+    # talii nie układamy od nowa - tasowanie dowolnej permutacji daje równie losowy wynik
+    def deal(self, count: int) -> List[int]:
+        deck = self._deck
+        randrange = self.rng.randrange
+        n = len(deck)
+        for i in range(count):
+            j = randrange(i, n)
+            deck[i], deck[j] = deck[j], deck[i]
+        return deck[:count]
+
+    def deal_cards(self, count: int) -> List[Card]:
+        return [CARDS[c] for c in self.deal(count)]
+
+    # talia na jedno rozdanie: najpierw karty graczy, potem karty na stół z wypaleniem
+    def deal_hand(self, num_players: int) -> List[Card]:
+        return self.deal_cards(2 * num_players + BOARD_CARDS)
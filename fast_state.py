@@ -0,0 +1,272 @@
+import time
+from typing import List, Tuple, Dict, Callable, Optional, Any, Generator
+from models import Card, Player, GameState, ActionType, GameEvent
+
+# szybki stan stołu do symulacji - zamiast zamrożonych Player/GameState i replace()
+# trzymamy osobne listy dla każdego pola gracza (chips[i], bets[i] ...) i zmieniamy je w miejscu.
+# reguły są takie same jak w poker_logic, komunikaty też.
+# migawki Player/GameState dla kontrolerów są zapamiętywane i budowane od nowa tylko dla miejsc,
+# które zmieniły się od poprzedniej decyzji - dlatego pola zmieniamy wyłącznie metodami tej klasy
+class FastState:
+    __slots__ = ("names", "controllers", "hands", "chips", "bets", "total_bets", "folded", "all_in",
+                 "deck", "community_cards", "pot", "current_bet", "dealer_index", "min_raise", "observers",
+                 "_players", "_dirty", "_state")
+
+    def __init__(self, players: List[Player], deck: List[Card], community_cards: List[Card], pot: int = 0,
+                 current_bet: int = 0, dealer_index: int = 0, min_raise: int = 20, observers: Tuple[Any, ...] = ()):
+        self.names: List[str] = [p.name for p in players]
+        self.controllers: List[Any] = [p.controller for p in players]
+        self.hands: List[Tuple[Card, ...]] = [p.hand for p in players]
+        self.chips: List[int] = [p.chips for p in players]
+        self.bets: List[int] = [p.current_bet for p in players]
+        self.total_bets: List[int] = [p.total_bet_in_hand for p in players]
+        self.folded: List[bool] = [p.folded for p in players]
+        self.all_in: List[bool] = [p.is_all_in for p in players]
+        self.deck = list(deck)
+        self.community_cards = list(community_cards)
+        self.pot = pot
+        self.current_bet = current_bet
+        self.dealer_index = dealer_index
+        self.min_raise = min_raise
+        self.observers = observers
+        self._players: List[Optional[Player]] = list(players)
+        self._dirty: List[int] = []  # miejsca z nieaktualną migawką
+        self._state: Optional[GameState] = None
+
+    @classmethod
+    def from_game_state(cls, state: GameState) -> "FastState":
+        return cls(state.players, state.deck, state.community_cards, state.pot, state.current_bet,
+                   state.dealer_index, state.min_raise, state.observers)
+
+    def player(self, i: int) -> Player:
+        p = self._players[i]
+        if p is None:
+            p = self._players[i] = Player(name=self.names[i], chips=self.chips[i], hand=self.hands[i],
+                                          controller=self.controllers[i], folded=self.folded[i],
+                                          is_all_in=self.all_in[i], current_bet=self.bets[i],
+                                          total_bet_in_hand=self.total_bets[i])
+        return p
+
+    def to_game_state(self) -> GameState:
+        if self._state is None:
+            for i in self._dirty:
+                self.player(i)
+            self._dirty = []
+            self._state = GameState(deck=list(self.deck), players=list(self._players),
+                                    community_cards=list(self.community_cards), pot=self.pot,
+                                    current_bet=self.current_bet, dealer_index=self.dealer_index,
+                                    min_raise=self.min_raise, observers=self.observers)
+        return self._state
+
+    # unieważnienie migawek: jednego miejsca (i) albo wszystkich (None)
+    def _changed(self, i: Optional[int] = None) -> None:
+        if i is None:
+            self._players = [None] * len(self.names)
+            self._dirty = list(range(len(self.names)))
+        else:
+            self._players[i] = None
+            self._dirty.append(i)
+        self._state = None
+
+    # odpowiedniki funkcji z poker_logic
+
+    def deal_hands(self, deck: List[Card]) -> None:
+        n = len(self.names)
+        for i in range(n):
+            self.hands[i] = tuple(deck[i * 2: (i + 1) * 2])
+            self.folded[i] = False
+            self.all_in[i] = False
+            self.bets[i] = 0
+            self.total_bets[i] = 0
+        self.deck = deck[n * 2:]
+        self._changed()
+
+    def deal_table(self, n: int) -> List[GameEvent]:
+        if len(self.deck) < n + 1:
+            return [GameEvent("Błąd: Za mało kart w talii!")]
+        drawn = self.deck[1: n + 1]  # Burn 1
+        del self.deck[:n + 1]
+        self.community_cards += drawn
+        self._state = None
+        for obs in self.observers:
+            obs.on_table_dealt(drawn)
+        return [GameEvent(f"Na stół spadają: {drawn}")]
+
+    def _pay_blind(self, i: int, amount: int) -> int:
+        actual = min(self.chips[i], amount)
+        self.chips[i] -= actual
+        self.bets[i] = actual
+        self.total_bets[i] += actual
+        self.all_in[i] = self.chips[i] == 0
+        self._changed(i)
+        return actual
+
+    def post_blinds(self, sb_amount: int = 10, bb_amount: int = 20) -> List[GameEvent]:
+        n = len(self.names)
+        if n < 2: return []
+
+        sb_idx = (self.dealer_index + 1) % n
+        bb_idx = (self.dealer_index + 2) % n
+        if n == 2:
+            sb_idx = self.dealer_index
+            bb_idx = (self.dealer_index + 1) % n
+        for obs in self.observers:
+            obs.on_hand_start(self.names, list(self.chips), list(self.hands), self.deck, self.dealer_index)
+
+        sb = self._pay_blind(sb_idx, sb_amount)
+        bb = self._pay_blind(bb_idx, bb_amount)
+        for obs in self.observers:
+            obs.on_blinds(sb_idx, sb, bb_idx, bb)
+        self.pot += sb + bb
+        self.current_bet = bb_amount
+        self._state = None
+        return [GameEvent(f"{self.names[sb_idx]} wpłaca SB {sb}"), GameEvent(f"{self.names[bb_idx]} wpłaca BB {bb}")]
+
+    def reset_bets(self) -> None:
+        self.bets = [0] * len(self.names)
+        self.current_bet = 0
+        self.min_raise = 20
+        self._changed()
+
+    def legal_actions(self, i: int) -> List[ActionType]:
+        actions = [ActionType.FOLD]
+        amount_to_call = self.current_bet - self.bets[i]
+        actions.append(ActionType.CHECK if amount_to_call == 0 else ActionType.CALL)
+        if self.chips[i] > amount_to_call:
+            actions.append(ActionType.RAISE)
+        if self.chips[i] > 0:
+            actions.append(ActionType.ALL_IN)
+        return actions
+
+    def apply_action(self, i: int, action: ActionType, raise_amount: int) -> str:
+        total_before = self.total_bets[i]
+        msg = self._apply(i, action, raise_amount)
+        self._changed(i)
+        for obs in self.observers:
+            obs.on_action(i, action, self.total_bets[i] - total_before, self.pot)
+        return msg
+
+    def _apply(self, i: int, action: ActionType, raise_amount: int) -> str:
+        name = self.names[i]
+        if action == ActionType.FOLD:
+            self.folded[i] = True
+            return f"{name}: Pas"
+
+        if action == ActionType.CHECK:
+            return f"{name}: Czekam"
+
+        if action == ActionType.CALL:
+            actual = min(self.current_bet - self.bets[i], self.chips[i])
+            self.chips[i] -= actual
+            self.bets[i] += actual
+            self.total_bets[i] += actual
+            self.pot += actual
+            if self.chips[i] == 0: self.all_in[i] = True
+            return f"{name}: Sprawdzam ({actual})"
+
+        if action == ActionType.RAISE:
+            contribution = raise_amount - self.bets[i]
+            self.chips[i] -= contribution
+            raise_diff = raise_amount - self.current_bet
+            if raise_diff > 0:
+                self.min_raise = raise_diff
+            self.bets[i] = raise_amount
+            self.total_bets[i] += contribution
+            self.pot += contribution
+            self.current_bet = raise_amount
+            return f"{name}: Podbijam do {raise_amount}"
+
+        if action == ActionType.ALL_IN:
+            contribution = self.chips[i]
+            self.chips[i] = 0
+            self.bets[i] += contribution
+            self.total_bets[i] += contribution
+            self.all_in[i] = True
+            self.pot += contribution
+            if self.bets[i] > self.current_bet:
+                raise_diff = self.bets[i] - self.current_bet
+                if raise_diff >= self.min_raise:
+                    self.min_raise = raise_diff
+                self.current_bet = self.bets[i]
+            return f"{name}: All-in ({contribution})"
+
+        return ""
+
+    # ta sama licytacja co poker_logic.run_betting_round, kontrolery dostają (zapamiętaną) migawkę GameState
+    def run_betting_round(self, on_action_callback: Optional[Callable[[GameState, str], None]] = None,
+                          action_delay: float = 0.0) -> List[GameEvent]:
+        events: List[GameEvent] = []
+        steps = self.betting_steps(events, on_action_callback, action_delay)
+        decision = None
+        try:
+            while True:
+                i, legal = steps.send(decision)
+                controller = self.controllers[i]
+                if controller is None:
+                    decision = ActionType.CHECK, 0
+                else:
+                    decision = controller.decide_action(self.player(i), self.to_game_state(), legal)
+        except StopIteration:
+            pass
+        return events
+
+    # przebieg licytacji jako generator: oddaje (miejsce, dozwolone akcje) i czeka na (akcja, kwota).
+    # dzięki temu tę samą licytację prowadzi run_betting_round i stół asynchroniczny (async_table)
+    def betting_steps(self, events: List[GameEvent],
+                      on_action_callback: Optional[Callable[[GameState, str], None]] = None,
+                      action_delay: float = 0.0) -> Generator[Tuple[int, List[ActionType]], Tuple[ActionType, int], None]:
+        n = len(self.names)
+        if not self.community_cards:
+            actor_ptr = (self.dealer_index + 3) % n
+            if n == 2:
+                actor_ptr = self.dealer_index
+        else:
+            actor_ptr = (self.dealer_index + 1) % n
+
+        num_not_folded = 0
+        num_active = 0
+        bet_counts: Dict[int, int] = {}
+        for i in range(n):
+            if not self.folded[i]:
+                num_not_folded += 1
+                if not self.all_in[i]:
+                    num_active += 1
+                    bet_counts[self.bets[i]] = bet_counts.get(self.bets[i], 0) + 1
+
+        players_acted = 0
+
+        while True:
+            if num_not_folded == 1:
+                break
+            if bet_counts.get(self.current_bet, 0) == num_active and players_acted >= num_active:
+                break
+            if num_active < 2 and (num_active == 0 or next(iter(bet_counts)) >= self.current_bet):
+                break
+
+            i = actor_ptr % n
+            actor_ptr += 1
+            if self.folded[i] or self.all_in[i]:
+                continue
+
+            action, amount = yield i, self.legal_actions(i)
+
+            prev_bet = self.current_bet
+            old_bet = self.bets[i]
+            msg = self.apply_action(i, action, amount)
+            events.append(GameEvent(msg))
+
+            bet_counts[old_bet] -= 1
+            if bet_counts[old_bet] == 0:
+                del bet_counts[old_bet]
+            num_active -= 1
+            if self.folded[i]:
+                num_not_folded -= 1
+            elif not self.all_in[i]:
+                num_active += 1
+                bet_counts[self.bets[i]] = bet_counts.get(self.bets[i], 0) + 1
+
+            if on_action_callback:
+                on_action_callback(self.to_game_state(), msg)
+                if action_delay > 0:
+                    time.sleep(action_delay)
+            players_acted = 1 if self.current_bet > prev_bet else players_acted + 1
@@ -1,6 +1,7 @@
 import pygame
 import math
-from models import Suit, ActionType
+from collections import OrderedDict
+from models import Suit, ActionType, Card
 
 # kolory i wymiary
 SCREEN_WIDTH, SCREEN_HEIGHT = 1280, 720 # rozdzielczosci ekranu
@@ -23,6 +24,10 @@ SLIDER_FILL = (0, 200, 100)
 
 CARD_W, CARD_H = 60, 90
 FONT_SIZE = 20
+TEXT_CACHE_SIZE = 512  # ile wyrenderowanych napisów trzymamy (log, nazwy, kwoty)
+
+RANK_STR = {11: 'J', 12: 'Q', 13: 'K', 14: 'A'}
+SUIT_SYM = {Suit.HEARTS: '♥', Suit.DIAMONDS: '♦', Suit.SPADES: '♠', Suit.CLUBS: '♣'}
 class Slider:
     def __init__(self, x, y, w, h, min_val, max_val):
         self.rect = pygame.Rect(x, y, w, h)
@@ -70,10 +75,46 @@ class PokerGUI:
         self.raise_slider = None
         self.confirm_raise_btn = None
         self.next_round_btn = None
+        # gotowe powierzchnie - co klatkę tylko je kopiujemy (blit) zamiast rysować od nowa
+        self.text_cache = OrderedDict()
+        self.build_surfaces()
+
+    # karty (52 twarze i rewers), stół i tło logu rysujemy raz - okno ma stały rozmiar
+    def build_surfaces(self):
+        self.card_faces = {(rank, suit): self.render_card_face(Card(rank, suit))
+                           for suit in Suit for rank in range(2, 15)}
+        self.card_back = self.render_card_back()
+
+        self.table_surface = pygame.Surface((980, 530), pygame.SRCALPHA)
+        rim_rect = self.table_surface.get_rect()
+        pygame.draw.ellipse(self.table_surface, TABLE_RIM_COLOR, rim_rect)
+        pygame.draw.ellipse(self.table_surface, (50, 30, 10), rim_rect, 3)
+        table_rect = pygame.Rect(0, 0, 930, 480)
+        table_rect.center = rim_rect.center
+        pygame.draw.ellipse(self.table_surface, TABLE_FELT_COLOR, table_rect)
+        pygame.draw.ellipse(self.table_surface, (30, 110, 30), table_rect, 2)
+
+        self.log_panel = pygame.Surface((LOG_WIDTH, self.screen.get_height()))
+        self.log_panel.fill((25, 30, 40))
+
+        self.msg_overlay = pygame.Surface(((SCREEN_WIDTH - LOG_WIDTH) - 100, 40), pygame.SRCALPHA)
+        self.msg_overlay.fill((0, 0, 0, 180))
+
+    def render_text(self, text, font, color):
+        key = (text, font, color)
+        surf = self.text_cache.get(key)
+        if surf is not None:
+            self.text_cache.move_to_end(key)
+            return surf
+        surf = font.render(text, True, color)
+        self.text_cache[key] = surf
+        if len(self.text_cache) > TEXT_CACHE_SIZE:
+            self.text_cache.popitem(last=False)
+        return surf
 
     def draw_text(self, text, x, y, color=WHITE, center=True, font=None):
         f = font if font else self.font
-        surf = f.render(str(text), True, color)
+        surf = self.render_text(str(text), f, tuple(color))
         rect = surf.get_rect()
         if center:
             rect.center = (x, y)
@@ -81,17 +122,29 @@ class PokerGUI:
             rect.topleft = (x, y)
         self.screen.blit(surf, rect)
 
-    def draw_card(self, card, x, y):
-        rect = pygame.Rect(x, y, CARD_W, CARD_H)
-        pygame.draw.rect(self.screen, WHITE, rect, border_radius=5)
-        pygame.draw.rect(self.screen, BLACK, rect, 2, border_radius=5)
+    def render_card_face(self, card):
+        surf = pygame.Surface((CARD_W, CARD_H), pygame.SRCALPHA)
+        rect = surf.get_rect()
+        pygame.draw.rect(surf, WHITE, rect, border_radius=5)
+        pygame.draw.rect(surf, BLACK, rect, 2, border_radius=5)
 
         color = RED if card.suit in [Suit.HEARTS, Suit.DIAMONDS] else BLACK
-        rank_str = {11: 'J', 12: 'Q', 13: 'K', 14: 'A'}.get(card.rank, str(card.rank))
-        suit_sym = {Suit.HEARTS: '♥', Suit.DIAMONDS: '♦', Suit.SPADES: '♠', Suit.CLUBS: '♣'}.get(card.suit, '?')
+        rank_surf = self.font.render(RANK_STR.get(card.rank, str(card.rank)), True, color)
+        suit_surf = self.font.render(SUIT_SYM.get(card.suit, '?'), True, color)
+        surf.blit(rank_surf, rank_surf.get_rect(center=(15, 20)))
+        surf.blit(suit_surf, suit_surf.get_rect(center=(CARD_W - 15, CARD_H - 20)))
+        return surf
+
+    def render_card_back(self):
+        surf = pygame.Surface((CARD_W, CARD_H), pygame.SRCALPHA)
+        rect = surf.get_rect()
+        pygame.draw.rect(surf, (60, 60, 180), rect, border_radius=5)
+        pygame.draw.rect(surf, WHITE, rect, 2, border_radius=5)
+        pygame.draw.rect(surf, (80, 80, 200), (5, 5, CARD_W - 10, CARD_H - 10), border_radius=3)
+        return surf
 
-        self.draw_text(rank_str, x + 15, y + 20, color)
-        self.draw_text(suit_sym, x + CARD_W - 15, y + CARD_H - 20, color)
+    def draw_card(self, card, x, y):
+        self.screen.blit(self.card_faces[(card.rank, card.suit)], (x, y))
 
     def draw_player(self, player, idx, total_players, is_active_actor, show_all_cards, override_hand=None):
         cx, cy = (SCREEN_WIDTH - LOG_WIDTH) // 2, SCREEN_HEIGHT // 2 - 40
@@ -140,11 +193,7 @@ class PokerGUI:
                 if should_show_face:
                     self.draw_card(c, pos_x, card_y)
                 else:
-                    r = pygame.Rect(pos_x, card_y, CARD_W, CARD_H)
-                    pygame.draw.rect(self.screen, (60, 60, 180), r, border_radius=5)
-                    pygame.draw.rect(self.screen, WHITE, r, 2, border_radius=5)
-                    pygame.draw.rect(self.screen, (80, 80, 200), (pos_x + 5, card_y + 5, CARD_W - 10, CARD_H - 10),
-                                     border_radius=3)
+                    self.screen.blit(self.card_back, (pos_x, card_y))
 
         if player.current_bet > 0:
             self.draw_text(f"Bet: {player.current_bet}", x, y + 95, WHITE)
@@ -152,15 +201,7 @@ class PokerGUI:
     def draw_table_info(self, state, pot, override_community=None):
         cx, cy = (SCREEN_WIDTH - LOG_WIDTH) // 2, SCREEN_HEIGHT // 2 - 40
 
-        rim_rect = pygame.Rect(0, 0, 980, 530)
-        rim_rect.center = (cx, cy)
-        pygame.draw.ellipse(self.screen, TABLE_RIM_COLOR, rim_rect)
-        pygame.draw.ellipse(self.screen, (50, 30, 10), rim_rect, 3)
-
-        table_rect = pygame.Rect(0, 0, 930, 480)
-        table_rect.center = (cx, cy)
-        pygame.draw.ellipse(self.screen, TABLE_FELT_COLOR, table_rect)
-        pygame.draw.ellipse(self.screen, (30, 110, 30), table_rect, 2)
+        self.screen.blit(self.table_surface, self.table_surface.get_rect(center=(cx, cy)))
 
         # Użyj kart ze stanu LUB z zapisu (snapshotu)
         cards = override_community if override_community is not None else state.community_cards
@@ -174,10 +215,7 @@ class PokerGUI:
 
     def draw_action_log(self, logs):
         # tlo panelu
-        panel_rect = pygame.Rect(SCREEN_WIDTH - LOG_WIDTH, 0, LOG_WIDTH, SCREEN_HEIGHT)
-        s = pygame.Surface((LOG_WIDTH, SCREEN_HEIGHT))
-        s.fill((25, 30, 40))
-        self.screen.blit(s, (SCREEN_WIDTH - LOG_WIDTH, 0))
+        self.screen.blit(self.log_panel, (SCREEN_WIDTH - LOG_WIDTH, 0))
         pygame.draw.line(self.screen, (100, 100, 100), (SCREEN_WIDTH - LOG_WIDTH, 0),
                          (SCREEN_WIDTH - LOG_WIDTH, SCREEN_HEIGHT), 2)
 
@@ -287,9 +325,7 @@ class PokerGUI:
             msg_width = (SCREEN_WIDTH - LOG_WIDTH) - 100
             msg_rect = pygame.Rect(50, 10, msg_width, 40)
 
-            s = pygame.Surface((msg_rect.width, msg_rect.height), pygame.SRCALPHA)
-            s.fill((0, 0, 0, 180))
-            self.screen.blit(s, msg_rect.topleft)
+            self.screen.blit(self.msg_overlay, msg_rect.topleft)
 
             pygame.draw.rect(self.screen, GOLD, msg_rect, 1, border_radius=5)
             self.draw_text(human_msg, 50 + msg_width // 2, 30, GOLD)
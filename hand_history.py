@@ -0,0 +1,102 @@
+import struct
+from collections import namedtuple
+from enum import IntEnum
+from typing import List, Tuple, Dict, Iterator
+from models import Card, ActionType
+from poker_logic import GameObserver
+import poker_evaluator
+
+# binarna historia rozdań: każdy rekord ma stałe 12 bajtów
+# (typ, miejsce, a, b, kwota, extra) - znaczenie pól zależy od typu rekordu
+MAGIC = b"PHH1"
+RECORD = struct.Struct("<BBBBii")
+NO_CARD = 255
+
+class RecordType(IntEnum):
+    HAND_START = 1  # seat = liczba graczy, a = dealer, amount = numer rozdania
+    SEAT = 2        # a, b = karty gracza, amount = żetony na start
+    BLIND = 3       # a = 0 SB / 1 BB, amount = wpłata
+    ACTION = 4      # a = ActionType, amount = dołożone żetony, extra = pula po ruchu
+    BOARD = 5       # seat = ile kart, a, b, amount = karty (NO_CARD gdy brak)
+    PAYOUT = 6      # amount = wygrana, extra = siła ręki z showdownu (0 gdy brak)
+    HAND_END = 7    # amount = rozdana pula
+
+HistoryRecord = namedtuple("HistoryRecord", ["kind", "seat", "a", "b", "amount", "extra"])
+
+def _card(cards: List[Card], i: int) -> int:
+    return poker_evaluator.card_to_int(cards[i]) if i < len(cards) else NO_CARD
+
+# zapis strumieniowy - rekordy zbierane w buforze i zrzucane na dysk paczkami
+class HandHistoryWriter(GameObserver):
+    def __init__(self, path: str, buffer_size: int = 1 << 16):
+        self._file = open(path, "wb")
+        self._file.write(MAGIC)
+        self._buf = bytearray()
+        self._buffer_size = buffer_size
+        self.hands = 0
+        self.records = 0
+
+    def _write(self, kind: RecordType, seat: int, a: int, b: int, amount: int, extra: int = 0) -> None:
+        self._buf += RECORD.pack(kind, seat, a, b, amount, extra)
+        self.records += 1
+        if len(self._buf) >= self._buffer_size:
+            self.flush()
+
+    def on_hand_start(self, names: List[str], chips: List[int], hands: List[Tuple[Card, ...]], deck: List[Card],
+                      dealer_index: int) -> None:
+        self.hands += 1
+        self._write(RecordType.HAND_START, len(chips), dealer_index, 0, self.hands)
+        for i, (c, hand) in enumerate(zip(chips, hands)):
+            self._write(RecordType.SEAT, i, _card(hand, 0), _card(hand, 1), c)
+
+    def on_blinds(self, sb_idx: int, sb_amount: int, bb_idx: int, bb_amount: int) -> None:
+        self._write(RecordType.BLIND, sb_idx, 0, 0, sb_amount)
+        self._write(RecordType.BLIND, bb_idx, 1, 0, bb_amount)
+
+    def on_action(self, player_idx: int, action: ActionType, amount: int, pot: int) -> None:
+        self._write(RecordType.ACTION, player_idx, action.value, 0, amount, pot)
+
+    def on_table_dealt(self, cards: List[Card]) -> None:
+        self._write(RecordType.BOARD, len(cards), _card(cards, 0), _card(cards, 1), _card(cards, 2))
+
+    def on_payouts(self, winnings: List[int], strengths: Dict[int, int]) -> None:
+        for i, won in enumerate(winnings):
+            if won:
+                self._write(RecordType.PAYOUT, i, 0, 0, won, strengths.get(i, 0))
+        self._write(RecordType.HAND_END, 0, 0, 0, sum(winnings))
+
+    def flush(self) -> None:
+        self._file.write(self._buf)
+        self._buf.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self._file.close()
+
+    def __enter__(self) -> "HandHistoryWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+def read_records(path: str, chunk_records: int = 4096) -> Iterator[HistoryRecord]:
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path}: to nie jest plik historii rozdań")
+        while True:
+            chunk = f.read(RECORD.size * chunk_records)
+            if not chunk:
+                break
+            for rec in RECORD.iter_unpack(chunk):
+                yield HistoryRecord(RecordType(rec[0]), *rec[1:])
+
+# rekordy pogrupowane po rozdaniach
+def read_hands(path: str) -> Iterator[List[HistoryRecord]]:
+    hand: List[HistoryRecord] = []
+    for rec in read_records(path):
+        if rec.kind == RecordType.HAND_START and hand:
+            yield hand
+            hand = []
+        hand.append(rec)
+    if hand:
+        yield hand
@@ -0,0 +1,181 @@
+import argparse
+import os
+import struct
+from typing import List, Tuple, Dict, Optional
+from models import Card, Player, GameState, ActionType
+from poker_logic import GameObserver
+import poker_evaluator
+import simulation
+
+# zapis do odtwarzania rozdań: dla każdego rozdania kolejność talii i decyzje graczy.
+# plik .idx obok trzyma przesunięcia (uint64) początku każdego rozdania,
+# więc rozdanie nr N czytamy jednym seek bez przeglądania całego pliku.
+# seed w nagłówku to seed całej symulacji (-1 gdy losowa), ten sam w każdym rozdaniu -
+# do odtworzenia rozdania wystarcza zapisana talia i decyzje
+HAND_HEADER = struct.Struct("<IqBBH")  # numer rozdania, seed symulacji, liczba graczy, dealer, liczba decyzji
+SEAT = struct.Struct("<iB")            # żetony na start, długość nazwy (potem nazwa w utf-8)
+DECISION = struct.Struct("<BBi")       # miejsce, ActionType, dołożone żetony
+
+def index_path(path: str) -> str:
+    return path + ".idx"
+
+class ReplayWriter(GameObserver):
+    def __init__(self, path: str, seed: Optional[int] = None):
+        self.seed = seed if seed is not None else -1
+        self._file = open(path, "wb")
+        self._index = open(index_path(path), "wb")
+        self.hands = 0
+        self._seats = b""
+        self._deck = b""
+        self._decisions = bytearray()
+        self._num_players = 0
+        self._dealer = 0
+
+    def on_hand_start(self, names: List[str], chips: List[int], hands: List[Tuple[Card, ...]], deck: List[Card],
+                      dealer_index: int) -> None:
+        self._num_players = len(names)
+        self._dealer = dealer_index
+        seats = bytearray()
+        for name, c in zip(names, chips):
+            raw = name.encode("utf-8")
+            seats += SEAT.pack(c, len(raw)) + raw
+        self._seats = bytes(seats)
+        # pełna talia w kolejności rozdawania: najpierw karty graczy, potem reszta
+        full_deck = [card for hand in hands for card in hand] + list(deck)
+        self._deck = bytes([len(full_deck)] + poker_evaluator.cards_to_ints(full_deck))
+        self._decisions = bytearray()
+
+    def on_action(self, player_idx: int, action: ActionType, amount: int, pot: int) -> None:
+        self._decisions += DECISION.pack(player_idx, action.value, amount)
+
+    def on_payouts(self, winnings: List[int], strengths: Dict[int, int]) -> None:
+        self.hands += 1
+        self._index.write(struct.pack("<Q", self._file.tell()))
+        self._file.write(HAND_HEADER.pack(self.hands, self.seed, self._num_players, self._dealer,
+                                          len(self._decisions) // DECISION.size))
+        self._file.write(self._seats)
+        self._file.write(self._deck)
+        self._file.write(self._decisions)
+
+    def close(self) -> None:
+        self._file.close()
+        self._index.close()
+
+    def __enter__(self) -> "ReplayWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+# zapisany przebieg jednego rozdania
+class RecordedHand:
+    def __init__(self, number: int, seed: int, dealer_index: int, names: List[str], chips: List[int],
+                 deck: List[Card], decisions: List[Tuple[int, ActionType, int]]):
+        self.number = number
+        self.seed = seed
+        self.dealer_index = dealer_index
+        self.names = names
+        self.chips = chips
+        self.deck = deck
+        self.decisions = decisions
+
+    # odtwarza rozdanie silnikiem gry, zwraca stan po każdej decyzji i na koniec po rozliczeniu
+    def replay(self) -> List[Tuple[GameState, str]]:
+        controller = ReplayController(self.decisions)
+        players = [Player(name=n, chips=c, hand=(), controller=controller) for n, c in zip(self.names, self.chips)]
+        timeline: List[Tuple[GameState, str]] = []
+        final, events = simulation.play_hand(players, self.dealer_index,
+                                             on_action_callback=lambda s, msg: timeline.append((s, msg)),
+                                             deck=list(self.deck))
+        timeline.append((final, events[-1].message if events else ""))
+        return timeline
+
+    def state_at(self, action_index: int) -> GameState:
+        timeline = self.replay()
+        return timeline[min(action_index, len(timeline) - 1)][0]
+
+# kontroler, który zamiast myśleć powtarza zapisane decyzje
+class ReplayController:
+    def __init__(self, decisions: List[Tuple[int, ActionType, int]]):
+        self._decisions = iter(decisions)
+
+    def decide_action(self, player: Player, state: GameState, legal_actions: List[ActionType]) -> Tuple[
+        ActionType, int]:
+        _, action, amount = next(self._decisions)
+        if action == ActionType.RAISE:
+            return action, player.current_bet + amount
+        return action, 0
+
+class ReplayReader:
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        self._index = open(index_path(path), "rb")
+        self.num_hands = os.path.getsize(index_path(path)) // 8
+
+    def _offset(self, number: int) -> int:
+        self._index.seek((number - 1) * 8)
+        return struct.unpack("<Q", self._index.read(8))[0]
+
+    # numer rozdania od 1, jak w zapisie
+    def hand(self, number: int) -> RecordedHand:
+        if not 1 <= number <= self.num_hands:
+            raise IndexError(f"Brak rozdania nr {number} (w pliku jest {self.num_hands})")
+        self._file.seek(self._offset(number))
+        num, seed, num_players, dealer, num_decisions = HAND_HEADER.unpack(self._file.read(HAND_HEADER.size))
+
+        names, chips = [], []
+        for _ in range(num_players):
+            c, name_len = SEAT.unpack(self._file.read(SEAT.size))
+            chips.append(c)
+            names.append(self._file.read(name_len).decode("utf-8"))
+
+        deck_len = self._file.read(1)[0]
+        deck = [poker_evaluator.int_to_card(c) for c in self._file.read(deck_len)]
+
+        raw = self._file.read(DECISION.size * num_decisions)
+        decisions = [(seat, ActionType(action), amount) for seat, action, amount in DECISION.iter_unpack(raw)]
+        return RecordedHand(num, seed, dealer, names, chips, deck, decisions)
+
+    def __len__(self) -> int:
+        return self.num_hands
+
+    def close(self) -> None:
+        self._file.close()
+        self._index.close()
+
+    def __enter__(self) -> "ReplayReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Zapis i odtwarzanie rozdań")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="symulacja z zapisem do odtwarzania")
+    rec.add_argument("path")
+    rec.add_argument("--hands", type=int, default=1000)
+    rec.add_argument("--players", type=int, default=6)
+    rec.add_argument("--seed", type=int, default=None)
+    show = sub.add_parser("show", help="stan rozdania po danej decyzji")
+    show.add_argument("path")
+    show.add_argument("hand", type=int)
+    show.add_argument("--action", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        with ReplayWriter(args.path, args.seed) as writer:
+            result = simulation.run_simulation(args.hands, args.players, seed=args.seed, observers=(writer,))
+        print(f"Zapisano {result.hands} rozdań do {args.path}")
+        return
+
+    with ReplayReader(args.path) as reader:
+        hand = reader.hand(args.hand)
+        timeline = hand.replay()
+        steps = timeline if args.action is None else timeline[:args.action + 1]
+        print(f"Rozdanie #{hand.number} (seed symulacji {hand.seed}), dealer: {hand.names[hand.dealer_index]}")
+        for state, msg in steps:
+            print(f"{msg:40s} pula: {state.pot}, stół: {state.community_cards}")
+
+if __name__ == "__main__":
+    main()
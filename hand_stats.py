@@ -0,0 +1,181 @@
+import json
+import os
+from math import sqrt
+from typing import List, Tuple, Dict, Optional, Any
+from models import Card, ActionType, HandValue
+from poker_logic import GameObserver
+import poker_evaluator
+
+# statystyki liczone w locie, w stałej pamięci niezależnie od liczby rozdań:
+# bb/100 ze średnią i wariancją (Welford), VPIP/PFR, showdowny, układy na showdownie, histogram pul.
+# jeden obserwator liczy jeden stół naraz - przy wielu stołach każdy dostaje swój, a wyniki łączy merge()
+
+POT_BUCKETS = 16  # kubełki co potęgę dwójki w big blindach: 0 = <1bb, 1 = 1bb, 2 = 2-3bb, 3 = 4-7bb ...
+
+class RunningStat:
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, x: float) -> None:
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    # łączenie dwóch niezależnych serii (Chan i in.)
+    def merge(self, other: "RunningStat") -> None:
+        if other.n == 0:
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.n = n
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+class SeatStats:
+    def __init__(self):
+        self.result_bb = RunningStat()  # wynik rozdania w big blindach
+        self.vpip = 0
+        self.pfr = 0
+        self.showdowns = 0
+        self.showdowns_won = 0
+
+    def merge(self, other: "SeatStats") -> None:
+        self.result_bb.merge(other.result_bb)
+        self.vpip += other.vpip
+        self.pfr += other.pfr
+        self.showdowns += other.showdowns
+        self.showdowns_won += other.showdowns_won
+
+    def summary(self) -> Dict[str, float]:
+        n = self.result_bb.n
+        return {
+            "hands": n,
+            "bb_per_100": self.result_bb.mean * 100,
+            "bb_per_100_stderr": sqrt(self.result_bb.variance / n) * 100 if n else 0.0,
+            "vpip": self.vpip / n if n else 0.0,
+            "pfr": self.pfr / n if n else 0.0,
+            "showdowns": self.showdowns,
+            "showdown_win_rate": self.showdowns_won / self.showdowns if self.showdowns else 0.0,
+        }
+
+class HandStats(GameObserver):
+    def __init__(self, big_blind: int = 20, snapshot_path: Optional[str] = None, snapshot_every: int = 10000):
+        if snapshot_every < 1:
+            raise ValueError(f"snapshot_every musi być dodatnie, jest {snapshot_every}")
+        self.big_blind = big_blind
+        self.snapshot_path = snapshot_path
+        self.snapshot_every = snapshot_every
+        self.hands = 0
+        self.showdowns = 0
+        self.seats: Dict[str, SeatStats] = {}
+        self.showdown_hands = {value: 0 for value in HandValue}
+        self.pot_histogram = [0] * POT_BUCKETS
+        # stan bieżącego rozdania
+        self._names: List[str] = []
+        self._invested: List[int] = []
+        self._bets: List[int] = []
+        self._current_bet = 0
+        self._preflop = True
+        self._vpip: List[bool] = []
+        self._pfr: List[bool] = []
+
+    def on_hand_start(self, names: List[str], chips: List[int], hands: List[Tuple[Card, ...]], deck: List[Card],
+                      dealer_index: int) -> None:
+        n = len(names)
+        self._names = names
+        self._invested = [0] * n
+        self._bets = [0] * n
+        self._current_bet = 0
+        self._preflop = True
+        self._vpip = [False] * n
+        self._pfr = [False] * n
+
+    def on_blinds(self, sb_idx: int, sb_amount: int, bb_idx: int, bb_amount: int) -> None:
+        for i, amount in ((sb_idx, sb_amount), (bb_idx, bb_amount)):
+            self._invested[i] += amount
+            self._bets[i] = amount
+        self._current_bet = max(self._bets)
+
+    def on_action(self, player_idx: int, action: ActionType, amount: int, pot: int) -> None:
+        self._invested[player_idx] += amount
+        self._bets[player_idx] += amount
+        raised = self._bets[player_idx] > self._current_bet
+        if raised:
+            self._current_bet = self._bets[player_idx]
+        # VPIP - dobrowolne dołożenie żetonów przed flopem, PFR - podbicie przed flopem
+        if self._preflop and amount > 0:
+            self._vpip[player_idx] = True
+            if raised:
+                self._pfr[player_idx] = True
+
+    def on_table_dealt(self, cards: List[Card]) -> None:
+        self._preflop = False
+        self._bets = [0] * len(self._bets)
+        self._current_bet = 0
+
+    def on_payouts(self, winnings: List[int], strengths: Dict[int, int]) -> None:
+        self.hands += 1
+        showdown = len(strengths) > 1
+        if showdown:
+            self.showdowns += 1
+            for strength in strengths.values():
+                self.showdown_hands[poker_evaluator.hand_value(strength)] += 1
+
+        pot_bb = sum(winnings) // self.big_blind
+        self.pot_histogram[min(pot_bb.bit_length(), POT_BUCKETS - 1)] += 1
+
+        for i, name in enumerate(self._names):
+            seat = self.seats.get(name)
+            if seat is None:
+                seat = self.seats[name] = SeatStats()
+            seat.result_bb.add((winnings[i] - self._invested[i]) / self.big_blind)
+            seat.vpip += self._vpip[i]
+            seat.pfr += self._pfr[i]
+            if showdown and i in strengths:
+                seat.showdowns += 1
+                seat.showdowns_won += winnings[i] > 0
+
+        if self.snapshot_path and self.hands % self.snapshot_every == 0:
+            self.save(self.snapshot_path)
+
+    def merge(self, other: "HandStats") -> None:
+        self.hands += other.hands
+        self.showdowns += other.showdowns
+        for name, seat in other.seats.items():
+            self.seats.setdefault(name, SeatStats()).merge(seat)
+        for value, count in other.showdown_hands.items():
+            self.showdown_hands[value] += count
+        self.pot_histogram = [a + b for a, b in zip(self.pot_histogram, other.pot_histogram)]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "hands": self.hands,
+            "showdown_frequency": self.showdowns / self.hands if self.hands else 0.0,
+            "seats": {name: seat.summary() for name, seat in sorted(self.seats.items())},
+            "showdown_hands": {value.name: count for value, count in self.showdown_hands.items()},
+            "pot_histogram_bb": {("<1" if i == 0 else f"{1 << (i - 1)}+"): count
+                                 for i, count in enumerate(self.pot_histogram) if count},
+        }
+
+    # zapis przez plik tymczasowy - przerwany zapis nie psuje poprzedniej migawki
+    def save(self, path: str) -> None:
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp, path)
+
+    def summary_text(self) -> str:
+        snap = self.snapshot()
+        lines = [f"Rozdania: {snap['hands']}, showdowny: {snap['showdown_frequency']:.1%}",
+                 f"{'gracz':16s} {'rozdania':>9s} {'bb/100':>9s} {'+-':>7s} {'VPIP':>6s} {'PFR':>6s} {'W$SD':>6s}"]
+        for name, s in snap["seats"].items():
+            lines.append(f"{name:16s} {s['hands']:9d} {s['bb_per_100']:9.1f} {s['bb_per_100_stderr']:7.1f} "
+                         f"{s['vpip']:6.1%} {s['pfr']:6.1%} {s['showdown_win_rate']:6.1%}")
+        return "\n".join(lines)
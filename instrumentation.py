@@ -0,0 +1,153 @@
+import functools
+import json
+import time
+from typing import Any, Callable, Dict, List, Tuple, Union
+import controllers
+import poker_equity
+import poker_evaluator
+import poker_logic
+from fast_state import FastState
+
+# liczniki i histogramy czasów dla gorących funkcji silnika.
+# wyłączone nic nie kosztują: enable() podmienia funkcje na wersje mierzące czas,
+# disable() przywraca oryginały, więc bez pomiarów wołane są zwykłe funkcje
+
+STREETS = {0: "preflop", 3: "flop", 4: "turn", 5: "river"}
+
+def _street(community_cards: List[Any]) -> str:
+    return STREETS.get(len(community_cards), str(len(community_cards)))
+
+class Histogram:
+    # kubełki co potęgę dwójki w mikrosekundach: 0 = <1us, 1 = 1us, 2 = 2-3us, 3 = 4-7us ...
+    NUM_BUCKETS = 32
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.buckets = [0] * self.NUM_BUCKETS
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min: self.min = seconds
+        if seconds > self.max: self.max = seconds
+        self.buckets[min(int(seconds * 1e6).bit_length(), self.NUM_BUCKETS - 1)] += 1
+
+    # przybliżony percentyl - górna granica kubełka
+    def percentile(self, q: float) -> float:
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= target:
+                return (1 << i) / 1e6
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1000,
+            "mean_us": self.total / self.count * 1e6 if self.count else 0.0,
+            "min_us": self.min * 1e6 if self.count else 0.0,
+            "max_us": self.max * 1e6,
+            "p50_us": self.percentile(0.5) * 1e6,
+            "p99_us": self.percentile(0.99) * 1e6,
+        }
+
+timings: Dict[str, Histogram] = {}
+counters: Dict[str, int] = {}
+_patched: List[Tuple[Any, str, Any]] = []
+
+def count(name: str, n: int = 1) -> None:
+    counters[name] = counters.get(name, 0) + n
+
+def record(name: str, seconds: float) -> None:
+    hist = timings.get(name)
+    if hist is None:
+        hist = timings[name] = Histogram()
+    hist.add(seconds)
+
+def _timed(func: Callable, key: Union[str, Callable[..., str]]) -> Callable:
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record(key if isinstance(key, str) else key(*args, **kwargs), time.perf_counter() - start)
+    return wrapper
+
+# podmiana atrybutu (funkcji modułu albo metody klasy) na wersję mierzącą czas
+def instrument(owner: Any, attr: str, key: Union[str, Callable[..., str]]) -> None:
+    original = getattr(owner, attr)
+    _patched.append((owner, attr, original))
+    setattr(owner, attr, _timed(original, key))
+
+def _count_batch(*args, **kwargs) -> str:
+    count("evaluate_many.hands", len(args[0]))
+    return "evaluate_many"
+
+# adaptacyjne equity: oprócz czasu zliczamy, ile symulacji faktycznie policzono
+def _count_samples(func: Callable) -> Callable:
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        estimate = func(*args, **kwargs)
+        count("equity.adaptive.calls")
+        count("equity.adaptive.samples", estimate.samples)
+        return estimate
+    return wrapper
+
+def enabled() -> bool:
+    return bool(_patched)
+
+def enable() -> None:
+    if _patched:
+        return
+    instrument(poker_logic, "deal_hands", "deal_hands")
+    instrument(poker_logic, "post_blinds", "post_blinds")
+    instrument(poker_logic, "run_betting_round", lambda state, *a, **k: f"betting_round.{_street(state.community_cards)}")
+    instrument(poker_logic, "resolve_payouts", "resolve_payouts")
+    instrument(FastState, "deal_hands", "deal_hands")
+    instrument(FastState, "post_blinds", "post_blinds")
+    instrument(FastState, "run_betting_round", lambda self, *a, **k: f"betting_round.{_street(self.community_cards)}")
+    # czas decyzji osobno dla każdego gracza, żeby było widać który bot jest wolny
+    for cls in (controllers.SmartBotController, controllers.HumanConsoleController):
+        instrument(cls, "decide_action",
+                   lambda self, player, *a, **k: f"decide_action.{type(self).__name__}.{player.name}")
+    instrument(poker_evaluator, "evaluate_ints", "evaluate")
+    instrument(poker_evaluator.PartialHand, "strength_with", "evaluate.partial")
+    instrument(poker_evaluator, "evaluate_many", _count_batch)
+    instrument(poker_evaluator.PartialHand, "strength_many", lambda self, additions, *a, **k: _count_batch(additions))
+    instrument(poker_equity, "equity", "equity")
+    instrument(poker_equity, "estimate_equity", "equity.adaptive")
+    _patched.append((poker_equity, "estimate_equity", poker_equity.estimate_equity))
+    poker_equity.estimate_equity = _count_samples(poker_equity.estimate_equity)
+
+def disable() -> None:
+    while _patched:
+        owner, attr, original = _patched.pop()
+        setattr(owner, attr, original)
+
+def reset() -> None:
+    timings.clear()
+    counters.clear()
+
+def snapshot() -> Dict[str, Any]:
+    return {
+        "timings": {name: hist.summary() for name, hist in sorted(timings.items())},
+        "counters": dict(sorted(counters.items())),
+    }
+
+def snapshot_json(indent: int = 2) -> str:
+    return json.dumps(snapshot(), indent=indent)
+
+def snapshot_text() -> str:
+    lines = [f"{'nazwa':48s} {'ile':>9s} {'razem ms':>10s} {'śr. us':>9s} {'p50 us':>9s} {'p99 us':>9s} {'max us':>10s}"]
+    for name, s in snapshot()["timings"].items():
+        lines.append(f"{name:48s} {s['count']:9d} {s['total_ms']:10.1f} {s['mean_us']:9.1f} "
+                     f"{s['p50_us']:9.0f} {s['p99_us']:9.0f} {s['max_us']:10.0f}")
+    for name, n in snapshot()["counters"].items():
+        lines.append(f"{name:48s} {n:9d}")
+    return "\n".join(lines)
@@ -1,19 +1,26 @@
 import pygame
+import queue
 import threading
 import time
 import poker_logic
 from models import Player, GameState, ActionType
 from controllers import SmartBotController
+from poker_equity import EquityCache
 from gui_renderer import PokerGUI, SCREEN_WIDTH, SCREEN_HEIGHT
 
+STATE_CHANGED = pygame.USEREVENT + 1
+
+# wspólny stan logiki i GUI. logika zmienia go tylko przez publish(), które podbija wersję
+# i budzi GUI zdarzeniem STATE_CHANGED - GUI rysuje od nowa dopiero gdy wersja się zmieni.
+# decyzje gracza i "następne rozdanie" idą w drugą stronę kolejką inputs, na której logika czeka bez odpytywania
 class GameContext:
     def __init__(self):
+        self.lock = threading.Lock()
+        self.inputs = queue.Queue()
+        self.version = 0
         self.state: GameState = None
-        self.current_actor_idx = -1
         self.waiting_for_human = False
-        self.raising_mode = False
         self.legal_actions = []
-        self.human_decision = None
         self.game_over = False
         self.last_message = "Czekam na start..."
         self.show_all_cards = False
@@ -22,36 +29,58 @@ class GameContext:
         self.community_snapshot = []
         self.logs = []
 
+    def publish(self, log=None, **changes):
+        with self.lock:
+            for name, value in changes.items():
+                setattr(self, name, value)
+            if log is not None:
+                self.logs.append(log)
+                #log do 50 wpisów
+                if len(self.logs) > 50:
+                    self.logs.pop(0)
+            self.version += 1
+        if pygame.display.get_init():
+            pygame.event.post(pygame.event.Event(STATE_CHANGED))
+
     def add_log(self, msg):
-        self.logs.append(msg)
-        #log do 50 wpisów
-        if len(self.logs) > 50:
-            self.logs.pop(0)
+        self.publish(log=msg)
+
+    # spójna kopia stanu dla GUI
+    def snapshot(self):
+        with self.lock:
+            return {
+                "version": self.version,
+                "state": self.state,
+                "waiting_for_human": self.waiting_for_human,
+                "legal_actions": list(self.legal_actions),
+                "last_message": self.last_message,
+                "show_all_cards": self.show_all_cards,
+                "waiting_for_next_round": self.waiting_for_next_round,
+                "showdown_hands": dict(self.showdown_hands),
+                "community_snapshot": list(self.community_snapshot),
+                "logs": list(self.logs),
+            }
+
+    # logika czeka tu na ruch gracza albo kliknięcie "dalej"; None = zamknięcie okna
+    def wait_input(self):
+        return self.inputs.get()
+
+    def send_input(self, value):
+        self.inputs.put(value)
 
 context = GameContext()
 def on_game_action(state, msg):
     #ta funkcja jest wołana przez poker_logic po kazdym ruchu bota/gracza
-    context.state = state
-    context.add_log(msg)
+    context.publish(log=msg, state=state)
 
 class HumanGuiController:
     def decide_action(self, player, state, legal_actions):
-        context.waiting_for_human = True
-        context.legal_actions = legal_actions
-        context.last_message = "Twój ruch!"
-        context.human_decision = None
-        context.raising_mode = False
-
-        while context.human_decision is None:
-            time.sleep(0.1)
-            if context.game_over:
-                return ActionType.FOLD, 0
-
-        action, amount = context.human_decision
-
-        context.waiting_for_human = False
-        context.raising_mode = False
-        return action, amount
+        context.publish(waiting_for_human=True, legal_actions=legal_actions, last_message="Twój ruch!")
+        decision = context.wait_input()
+        context.publish(waiting_for_human=False)
+        if decision is None or context.game_over:
+            return ActionType.FOLD, 0
+        return decision
 
 # logika gry
 def game_logic_thread(num_players):
@@ -59,24 +88,22 @@ def game_logic_thread(num_players):
     bot_names = ["Bot Andrzej", "Bot Bartek", "Bot Celina", "Bot Dominika","Bot Edward"]
 
     players = [human]
+    cache = EquityCache()  # wspólny dla botów przy tym stole
     for i in range(num_players - 1):
-        players.append(Player(name=bot_names[i], chips=1000, hand=(), controller=SmartBotController()))
+        players.append(Player(name=bot_names[i], chips=1000, hand=(), controller=SmartBotController(cache=cache)))
 
     dealer_idx = 0
     hand_count = 1
 
     deck = poker_logic.create_deck()
-    context.state = GameState(deck=deck, players=players, community_cards=[])
+    context.publish(state=GameState(deck=deck, players=players, community_cards=[]))
 
     while len([p for p in players if p.chips > 0]) > 1 and not context.game_over:
         active_players = [p for p in players if p.chips > 0]
         dealer_idx = dealer_idx % len(active_players)
 
-        context.last_message = f"Rozdanie #{hand_count}"
-        context.add_log(f"ROZDANIE #{hand_count} ---")
-        context.show_all_cards = False
-        context.showdown_hands = {}
-        context.community_snapshot = []  # Reset
+        context.publish(log=f"ROZDANIE #{hand_count} ---", last_message=f"Rozdanie #{hand_count}",
+                        show_all_cards=False, showdown_hands={}, community_snapshot=[])  # Reset
         time.sleep(1.5)
 
         deck = poker_logic.create_deck()
@@ -85,59 +112,51 @@ def game_logic_thread(num_players):
 
         state = GameState(deck=deck, players=active_players, community_cards=[],
                           dealer_index=dealer_idx)
-        context.state = state
+        context.publish(state=state)
 
         context.add_log("Pre-Flop")
         state, events = poker_logic.post_blinds(state)
         for e in events: context.add_log(e.message)
-        context.state = state
+        context.publish(state=state)
         time.sleep(0.5)
 
         state, events = poker_logic.run_betting_round(state, on_action_callback=on_game_action)
-        context.state = state
+        context.publish(state=state)
 
         if len([p for p in state.players if not p.folded]) > 1:
 
             state = poker_logic.reset_bets(state)
             state, events = poker_logic.deal_table(state, 3)
-            context.add_log(f"FLOP: {state.community_cards}")
-            context.state = state
+            context.publish(log=f"FLOP: {state.community_cards}", state=state)
             time.sleep(1)
             state, events = poker_logic.run_betting_round(state, on_action_callback=on_game_action)
-            context.state = state
+            context.publish(state=state)
 
             if len([p for p in state.players if not p.folded]) > 1:
 
                 state = poker_logic.reset_bets(state)
                 state, events = poker_logic.deal_table(state, 1)
-                context.add_log("TURN")
-                context.state = state
+                context.publish(log="TURN", state=state)
                 time.sleep(1)
                 state, events = poker_logic.run_betting_round(state, on_action_callback=on_game_action)
-                context.state = state
+                context.publish(state=state)
 
                 if len([p for p in state.players if not p.folded]) > 1:
 
                     state = poker_logic.reset_bets(state)
                     state, events = poker_logic.deal_table(state, 1)
-                    context.add_log("RIVER")
-                    context.state = state
+                    context.publish(log="RIVER", state=state)
                     time.sleep(1)
                     state, events = poker_logic.run_betting_round(state, on_action_callback=on_game_action)
-                    context.state = state
-
-        # snapshot kart graczy do podsumowania
-        for i, p in enumerate(state.players):
-            context.showdown_hands[i] = p.hand
-
-        # snapshot kart stolu do podsumowania
-        context.community_snapshot = list(state.community_cards)
+                    context.publish(state=state)
 
-        context.show_all_cards = True
+        # snapshot kart graczy i stolu do podsumowania
+        context.publish(showdown_hands={i: p.hand for i, p in enumerate(state.players)},
+                        community_snapshot=list(state.community_cards), show_all_cards=True)
 
         # rozliczenie
         state, events = poker_logic.resolve_payouts(state)
-        context.state = state
+        context.publish(state=state)
 
         winners_msg = ""
         for e in events:
@@ -145,16 +164,9 @@ def game_logic_thread(num_players):
             if "Pula" in e.message:
                 winners_msg = e.message.replace("Pula", "Wygrał:")
 
-        context.last_message = winners_msg if winners_msg else "Koniec rozdania"
-
-        context.waiting_for_next_round = True
-        while context.waiting_for_next_round:
-            time.sleep(0.1)
-            if context.game_over: break
-
-        context.show_all_cards = False
-        context.showdown_hands = {}
-        context.community_snapshot = []
+        context.publish(last_message=winners_msg if winners_msg else "Koniec rozdania", waiting_for_next_round=True)
+        context.wait_input()
+        context.publish(waiting_for_next_round=False, show_all_cards=False, showdown_hands={}, community_snapshot=[])
 
         players = state.players
         dealer_idx += 1
@@ -177,64 +189,93 @@ def main():
 
     running = True
     mouse_down = False
+    raising_mode = False
+    snap = context.snapshot()
+    redraw = True
 
     while running:
-        clock.tick(30)
+        # czekamy na zdarzenie (ruch myszy, klik albo nowy stan z logiki) zamiast rysować 30 razy na sekundę
+        events = [pygame.event.wait()] + pygame.event.get()
         mouse_pos = pygame.mouse.get_pos()
 
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
-                context.game_over = True
+                context.publish(game_over=True)
+                context.send_input(None)
+
+            elif event.type == STATE_CHANGED:
+                if context.version != snap["version"]:
+                    snap = context.snapshot()
+                    if not snap["waiting_for_human"]:
+                        raising_mode = False
+                    redraw = True
 
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:
                     mouse_down = True
+                    redraw = True
 
-                    if context.waiting_for_next_round:
+                    if snap["waiting_for_next_round"]:
                         if gui.next_round_btn and gui.next_round_btn.collidepoint(mouse_pos):
-                            context.waiting_for_next_round = False
+                            context.send_input(True)
+                            # drugi klik zanim logika ruszy nie może trafić do kolejki
+                            snap["waiting_for_next_round"] = False
 
-                    elif context.waiting_for_human:
-                        if not context.raising_mode:
+                    elif snap["waiting_for_human"]:
+                        if not raising_mode:
                             for action, rect in gui.buttons.items():
                                 if rect.collidepoint(mouse_pos):
                                     if action == ActionType.RAISE:
-                                        context.raising_mode = True
+                                        raising_mode = True
                                         gui.raise_slider = None
                                     else:
-                                        context.human_decision = (action, 0)
+                                        context.send_input((action, 0))
+                                        snap["waiting_for_human"] = False
                         else:
                             if gui.confirm_raise_btn and gui.confirm_raise_btn.collidepoint(mouse_pos):
                                 val = gui.raise_slider.val
-                                context.human_decision = (ActionType.RAISE, val)
+                                context.send_input((ActionType.RAISE, val))
+                                snap["waiting_for_human"] = False
+                                raising_mode = False
 
             elif event.type == pygame.MOUSEBUTTONUP:
                 mouse_down = False
+                redraw = True
 
-        if context.raising_mode and gui.raise_slider:
+            elif event.type in (pygame.MOUSEMOTION, pygame.WINDOWEXPOSED):
+                # podświetlenie przycisków i suwak zależą od pozycji myszy
+                redraw = True
+
+        if raising_mode and gui.raise_slider:
             gui.raise_slider.update(mouse_pos, mouse_down)
 
-        if context.state:
-            current_actor = 0 if context.waiting_for_human else -1
+        if not running or not redraw:
+            continue
+        redraw = False
+
+        if snap["state"]:
+            current_actor = 0 if snap["waiting_for_human"] else -1
 
             gui.render(
-                state=context.state,
-                human_msg=context.last_message,
-                legal_actions=context.legal_actions,
-                waiting_for_human=context.waiting_for_human,
+                state=snap["state"],
+                human_msg=snap["last_message"],
+                legal_actions=snap["legal_actions"],
+                waiting_for_human=snap["waiting_for_human"],
                 current_actor_idx=current_actor,
-                show_all_cards=context.show_all_cards,
-                raising_mode=context.raising_mode,
-                wait_for_next=context.waiting_for_next_round,
-                showdown_hands=context.showdown_hands,
-                game_logs=context.logs,
-                override_community=context.community_snapshot if context.waiting_for_next_round else None
+                show_all_cards=snap["show_all_cards"],
+                raising_mode=raising_mode,
+                wait_for_next=snap["waiting_for_next_round"],
+                showdown_hands=snap["showdown_hands"],
+                game_logs=snap["logs"],
+                override_community=snap["community_snapshot"] if snap["waiting_for_next_round"] else None
             )
         else:
             screen.fill((35, 40, 50))
             gui.draw_text("Ładowanie gry...", SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
             pygame.display.flip()
+        # nie więcej niż 30 klatek na sekundę, nawet gdy zdarzeń jest dużo
+        clock.tick(30)
 
     pygame.quit()
 
@@ -60,4 +60,6 @@ class GameState:
     pot: int = 0
     current_bet: int = 0
     dealer_index: int = 0
-    min_raise: int = 20  # minimalne przebicie
\ No newline at end of file
+    min_raise: int = 20  # minimalne przebicie
+    # obserwatorzy zdarzeń rozdania (historia, statystyki) - patrz poker_logic.GameObserver
+    observers: Tuple[Any, ...] = field(default=(), compare=False, repr=False)
\ No newline at end of file
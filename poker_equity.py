@@ -0,0 +1,227 @@
+from typing import Sequence, Optional, Tuple, Dict, List
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import combinations, permutations
+from math import comb, sqrt
+from threading import Lock
+import numpy as np
+from models import Card
+import poker_evaluator
+
+# losuje bez powtórzeń `count` kart z talii dla każdej z `iterations` symulacji naraz.
+# częściowy Fisher-Yates: tasujemy tylko `count` pierwszych pozycji każdej talii, a nie całą talię.
+# przy dużej liczbie kart (np. 9 przeciwników przed flopem) szybsze jest pełne sortowanie losowych kluczy
+def sample_cards(deck: np.ndarray, count: int, iterations: int, rng: np.random.Generator) -> np.ndarray:
+    m = len(deck)
+    if 3 * count > m:
+        order = rng.random((iterations, m)).argsort(axis=1)[:, :count]
+        return deck[order]
+    decks = np.tile(deck, (iterations, 1))
+    rows = np.arange(iterations)
+    positions = np.arange(count)
+    picks = (rng.random((iterations, count)) * (m - positions)).astype(np.intp) + positions
+    for k in range(count):
+        j = picks[:, k]
+        picked = decks[rows, j]
+        decks[rows, j] = decks[:, k]
+        decks[:, k] = picked
+    return decks[:, :count]
+
+# znane karty i talia bez nich - wspólne dla wszystkich metod liczenia
+def _known_cards(hand: Sequence[Card], community_cards: Sequence[Card]) -> Tuple[List[int], List[int], np.ndarray]:
+    my_cards = poker_evaluator.cards_to_ints(hand)
+    board = poker_evaluator.cards_to_ints(community_cards)
+    known_cards = set(my_cards + board)
+    unknown_deck = np.array([c for c in range(52) if c not in known_cards], dtype=np.int64)
+    return my_cards, board, unknown_deck
+
+# wynik każdej z `iterations` losowych symulacji: 1 wygrana, 1/(remisujący+1) przy remisie, 0 przegrana
+# plansze i ręce przeciwników losujemy na raz jako tablice indeksów
+def _sample_outcomes(my_cards: List[int], board: List[int], unknown_deck: np.ndarray, iterations: int,
+                     rng: np.random.Generator, num_opponents: int) -> np.ndarray:
+    cards_needed = 5 - len(board)
+    drawn = sample_cards(unknown_deck, cards_needed + 2 * num_opponents, iterations, rng)
+    runouts = drawn[:, :cards_needed]
+
+    # znane karty sumujemy raz, w każdej iteracji dokładamy tylko brakujące
+    my_score = poker_evaluator.PartialHand(my_cards + board).strength_many(runouts)
+    # ręce wszystkich przeciwników w jednej tablicy (iteracje * przeciwnicy, 2 + brakujące karty)
+    opp_holes = drawn[:, cards_needed:].reshape(iterations, num_opponents, 2)
+    opp_runouts = np.broadcast_to(runouts[:, None, :], (iterations, num_opponents, cards_needed))
+    opp = np.concatenate([opp_holes, opp_runouts], axis=2).reshape(iterations * num_opponents, -1)
+    opp_score = poker_evaluator.PartialHand(board).strength_many(opp).reshape(iterations, num_opponents)
+    best_opp = opp_score.max(axis=1)
+    tied = (opp_score == my_score[:, None]).sum(axis=1)
+
+    return np.where(my_score > best_opp, 1.0, np.where(my_score == best_opp, 1.0 / (tied + 1), 0.0))
+
+# przy remisie pula dzieli się po równo między wszystkich z najlepszą ręką
+def monte_carlo_equity(hand: Sequence[Card], community_cards: Sequence[Card], iterations: int = 1000,
+                       rng: Optional[np.random.Generator] = None, num_opponents: int = 1) -> float:
+    if rng is None:
+        rng = np.random.default_rng()
+    my_cards, board, unknown_deck = _known_cards(hand, community_cards)
+    return _sample_outcomes(my_cards, board, unknown_deck, iterations, rng, num_opponents).sum() / iterations
+
+# domyślna szerokość przedziału ufności (95%) dla adaptacyjnego monte carlo, czyli ok. +-4 pkt. proc.
+DEFAULT_TARGET_WIDTH = 0.08
+
+@dataclass(frozen=True)
+class EquityEstimate:
+    equity: float
+    samples: int       # ile symulacji faktycznie policzono (0 = wynik dokładny)
+    half_width: float  # połowa szerokości przedziału ufności (0 dla wyniku dokładnego)
+
+# monte carlo partiami: po każdej partii liczymy wariancję wyników i kończymy, gdy przedział
+# ufności jest węższy niż target_width albo skończył się budżet max_samples.
+# oczywiste sytuacje (prawie pewna wygrana/przegrana) kończą się po pierwszej partii
+def adaptive_equity(hand: Sequence[Card], community_cards: Sequence[Card], num_opponents: int = 1,
+                    target_width: float = DEFAULT_TARGET_WIDTH, max_samples: int = 1000, batch_size: int = 200,
+                    rng: Optional[np.random.Generator] = None, z: float = 1.96) -> EquityEstimate:
+    if rng is None:
+        rng = np.random.default_rng()
+    my_cards, board, unknown_deck = _known_cards(hand, community_cards)
+    n = 0
+    total = 0.0
+    total_sq = 0.0
+    half_width = float("inf")
+    while n < max_samples:
+        outcomes = _sample_outcomes(my_cards, board, unknown_deck, min(batch_size, max_samples - n), rng,
+                                    num_opponents)
+        n += len(outcomes)
+        total += outcomes.sum()
+        total_sq += (outcomes * outcomes).sum()
+        variance = max(total_sq - total * total / n, 0.0) / (n - 1) if n > 1 else 0.25
+        half_width = z * sqrt(variance / n)
+        if 2 * half_width <= target_width:
+            break
+    return EquityEstimate(total / n, n, half_width)
+
+# ile jest różnych rozdań do przejrzenia: dokończenia stołu razy ręce przeciwnika
+def count_deals(num_unknown: int, cards_needed: int, num_opponents: int = 1) -> int:
+    total = comb(num_unknown, cards_needed)
+    left = num_unknown - cards_needed
+    for _ in range(num_opponents):
+        total *= comb(left, 2)
+        left -= 2
+    return total
+
+# dokładne equity heads-up: wszystkie dokończenia stołu i wszystkie ręce przeciwnika
+def exact_equity(hand: Sequence[Card], community_cards: Sequence[Card]) -> float:
+    my_cards, board, unknown_deck = _known_cards(hand, community_cards)
+    m = len(unknown_deck)
+    cards_needed = 5 - len(board)
+
+    # indeksy w unknown_deck, nakładające się karty odsiewamy maskami bitowymi
+    runouts = list(combinations(range(m), cards_needed))
+    runouts = np.array(runouts, dtype=np.int64).reshape(len(runouts), cards_needed)
+    pairs = np.array(list(combinations(range(m), 2)), dtype=np.int64)
+    runout_masks = (np.int64(1) << runouts).sum(axis=1)
+    pair_masks = (np.int64(1) << pairs[:, 0]) | (np.int64(1) << pairs[:, 1])
+    runout_idx, pair_idx = np.nonzero((runout_masks[:, None] & pair_masks[None, :]) == 0)
+
+    runout_cards = unknown_deck[runouts]
+    # nasza ręka liczona raz na każdy stół, przeciwnik raz na każdą parę kart;
+    # znane karty są już zsumowane, dokładamy tylko dokończenie stołu (i karty przeciwnika)
+    my_score = poker_evaluator.PartialHand(my_cards + board).strength_many(runout_cards)[runout_idx]
+    opp_score = poker_evaluator.PartialHand(board).strength_many(
+        np.concatenate([unknown_deck[pairs[pair_idx]], runout_cards[runout_idx]], axis=1))
+
+    wins = np.count_nonzero(my_score > opp_score)
+    ties = np.count_nonzero(my_score == opp_score)
+    return (wins + (ties * 0.5)) / len(opp_score)
+
+def _use_exact(hand: Sequence[Card], community_cards: Sequence[Card], num_opponents: int, max_exact: int) -> bool:
+    num_unknown = 52 - len(hand) - len(community_cards)
+    return num_opponents == 1 and count_deals(num_unknown, 5 - len(community_cards)) <= max_exact
+
+# dokładnie, gdy rozdań jest mało (turn i river heads-up), w przeciwnym razie monte carlo
+def equity(hand: Sequence[Card], community_cards: Sequence[Card], num_opponents: int = 1, iterations: int = 1000,
+           rng: Optional[np.random.Generator] = None, max_exact: int = 50000) -> float:
+    if _use_exact(hand, community_cards, num_opponents, max_exact):
+        return exact_equity(hand, community_cards)
+    return monte_carlo_equity(hand, community_cards, iterations, rng, num_opponents)
+
+# jak equity, ale monte carlo adaptacyjne: iterations to maksymalny budżet, a target_width
+# docelowa szerokość przedziału ufności
+def estimate_equity(hand: Sequence[Card], community_cards: Sequence[Card], num_opponents: int = 1,
+                    iterations: int = 1000, target_width: float = DEFAULT_TARGET_WIDTH, rng: Optional[np.random.Generator] = None,
+                    max_exact: int = 50000) -> EquityEstimate:
+    if _use_exact(hand, community_cards, num_opponents, max_exact):
+        return EquityEstimate(exact_equity(hand, community_cards), 0, 0.0)
+    return adaptive_equity(hand, community_cards, num_opponents, target_width, iterations, rng=rng)
+
+# --- pamięć podręczna equity z utożsamieniem kolorów ---
+# A♥K♥ na stole X i A♠K♠ na stole X z zamienionymi kolorami to ta sama sytuacja,
+# więc klucz to najmniejszy zapis spośród wszystkich 24 permutacji kolorów
+SUIT_PERMUTATIONS = list(permutations(range(4)))
+
+def canonical_key(hand: Sequence[Card], community_cards: Sequence[Card], num_opponents: int = 1) -> Tuple:
+    hole = poker_evaluator.cards_to_ints(hand)
+    board = poker_evaluator.cards_to_ints(community_cards)
+    best = None
+    for perm in SUIT_PERMUTATIONS:
+        key = (tuple(sorted((c & ~3) | perm[c & 3] for c in hole)),
+               tuple(sorted((c & ~3) | perm[c & 3] for c in board)))
+        if best is None or key < best:
+            best = key
+    return best + (num_opponents,)
+
+# bezpieczna dla wątków - boty stołu asynchronicznego mogą liczyć w osobnych wątkach (async_table)
+class EquityCache:
+    def __init__(self, maxsize: int = 100000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Tuple, float]" = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Tuple) -> Optional[float]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Tuple, value: float) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            # najdawniej używany wpis wylatuje pierwszy
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses,
+                    "hit_rate": self.hits / total if total else 0.0}
+
+# target_width=None - stała liczba iteracji, inaczej adaptacyjnie z iterations jako budżetem.
+# pamięć podręczna należy do jednej symulacji/stołu - trafienie pomija losowania z rng, więc cache
+# wspólny dla różnych przebiegów psułby powtarzalność przy tym samym seedzie. cache=None - bez pamięci
+def cached_equity(hand: Sequence[Card], community_cards: Sequence[Card], num_opponents: int = 1,
+                  iterations: int = 1000, rng: Optional[np.random.Generator] = None,
+                  cache: Optional[EquityCache] = None, target_width: Optional[float] = None) -> float:
+    key = canonical_key(hand, community_cards, num_opponents) + (iterations, target_width)
+    value = cache.get(key) if cache is not None else None
+    if value is None:
+        if target_width is None:
+            value = equity(hand, community_cards, num_opponents, iterations, rng)
+        else:
+            value = estimate_equity(hand, community_cards, num_opponents, iterations, target_width, rng).equity
+        if cache is not None:
+            cache.put(key, value)
+    return value
@@ -1,6 +1,8 @@
-from typing import List, Tuple
+from typing import List, Tuple, Dict, Sequence, Optional, Union
 from collections import Counter
-from models import Card, HandValue, Player
+from itertools import combinations_with_replacement
+from models import Card, HandValue, Player, Suit
+import numpy as np
 # sortowanie po sile karty - 2,3,4 az do asa
 def get_ranks(cards: List[Card]) -> List[int]:
     return sorted([c.rank for c in cards], reverse=True)
@@ -32,36 +34,25 @@ def check_straight(ranks: List[int]) -> Tuple[bool, int]:
 
     return False, 0
 
-#przeliczam na siłę ręki
-def evaluate(cards: List[Card]) -> Tuple[HandValue, List[int]]:
-    if not cards:
+# ocena samych wysokości kart (bez koloru) - z tego budujemy tablice
+def evaluate_ranks(ranks: List[int]) -> Tuple[HandValue, List[int]]:
+    if not ranks:
         return (HandValue.HIGH_CARD, [])
 
-    # poker
-    is_fl, fl_ranks, fl_cards = check_flush(cards)
-    if is_fl:
-        is_sf, sf_high = check_straight(fl_ranks)
-        if is_sf:
-            return (HandValue.STRAIGHT_FLUSH, [sf_high])
-
     # cztery takie same
-    ranks = get_ranks(cards)
+    ranks = sorted(ranks, reverse=True)
     counts = Counter(ranks)
     sorted_counts = sorted(counts.items(), key=lambda x: (x[1], x[0]), reverse=True)
 
     if sorted_counts[0][1] == 4:
         quad_rank = sorted_counts[0][0]
         kickers = [r for r in ranks if r != quad_rank]
-        return (HandValue.FOUR_OF_A_KIND, [quad_rank, kickers[0]])
+        return (HandValue.FOUR_OF_A_KIND, [quad_rank] + kickers[:1])
 
     #  full - para i trójka
     if sorted_counts[0][1] == 3 and len(sorted_counts) > 1 and sorted_counts[1][1] >= 2:
         return (HandValue.FULL_HOUSE, [sorted_counts[0][0], sorted_counts[1][0]])
 
-    #  kolor
-    if is_fl:
-        return (HandValue.FLUSH, fl_ranks[:5])
-
     #  strit
     is_str, str_high = check_straight(ranks)
     if is_str:
@@ -78,7 +69,7 @@ def evaluate(cards: List[Card]) -> Tuple[HandValue, List[int]]:
         pair1 = sorted_counts[0][0]
         pair2 = sorted_counts[1][0]
         kickers = [r for r in ranks if r != pair1 and r != pair2]
-        return (HandValue.TWO_PAIR, [pair1, pair2, kickers[0]])
+        return (HandValue.TWO_PAIR, [pair1, pair2] + kickers[:1])
    # para
     if sorted_counts[0][1] == 2:
         pair_rank = sorted_counts[0][0]
@@ -87,6 +78,219 @@ def evaluate(cards: List[Card]) -> Tuple[HandValue, List[int]]:
 
     return (HandValue.HIGH_CARD, ranks[:5])
 
+# ocena kart w jednym kolorze (min. 5) - poker albo kolor
+def evaluate_suited(ranks: List[int]) -> Tuple[HandValue, List[int]]:
+    ranks = sorted(ranks, reverse=True)
+    is_sf, sf_high = check_straight(ranks)
+    if is_sf:
+        return (HandValue.STRAIGHT_FLUSH, [sf_high])
+    return (HandValue.FLUSH, ranks[:5])
+
+# --- szybki ewaluator na liczbach ---
+# karta to liczba 0..51: (wysokosc - 2) * 4 + kolor
+# sila reki to jedna liczba: kategoria << 20 | 5 kickerow po 4 bity
+# porownanie liczb daje dokladnie ta sama kolejnosc co krotki (HandValue, kickery)
+SUIT_INDEX: Dict[Suit, int] = {s: i for i, s in enumerate(Suit)}
+SUITS: List[Suit] = list(Suit)
+CATEGORY_SHIFT = 20
+
+def card_to_int(card: Card) -> int:
+    return (card.rank - 2) * 4 + SUIT_INDEX[card.suit]
+
+def int_to_card(code: int) -> Card:
+    return Card((code >> 2) + 2, SUITS[code & 3])
+
+def cards_to_ints(cards: Sequence[Card]) -> List[int]:
+    return [(c.rank - 2) * 4 + SUIT_INDEX[c.suit] for c in cards]
+
+def encode_strength(score: Tuple[HandValue, List[int]]) -> int:
+    value, kickers = score
+    strength = int(value)
+    for i in range(5):
+        strength = (strength << 4) | (kickers[i] if i < len(kickers) else 0)
+    return strength
+
+def decode_strength(strength: int) -> Tuple[HandValue, List[int]]:
+    kickers = [(strength >> (16 - 4 * i)) & 0xF for i in range(5)]
+    # wysokosci kart sa >= 2, wiec zera na koncu to tylko dopelnienie
+    while kickers and kickers[-1] == 0:
+        kickers.pop()
+    return (HandValue(strength >> CATEGORY_SHIFT), kickers)
+
+def hand_value(strength: int) -> HandValue:
+    return HandValue(strength >> CATEGORY_SHIFT)
+
+# klucz wysokosci: suma 1 << (3 * wysokosc), max 4 karty jednej wysokosci mieszcza sie w 3 bitach
+# dzieki temu klucz mozna liczyc dodawaniem, niezaleznie od kolejnosci kart
+RANK_KEY: List[int] = [1 << (3 * (code >> 2)) for code in range(52)]
+RANK_BIT: List[int] = [1 << (code >> 2) for code in range(52)]
+RANK_KEY_MASK = (1 << 39) - 1
+# nad kluczem wysokosci trzymamy 4 liczniki kolorow po 4 bity, startuja od 3,
+# wiec najwyzszy bit licznika zapala sie dokladnie przy 5 kartach w kolorze
+SUIT_COUNT_SHIFT = 40
+SUIT_COUNT_BIAS = 0x3333 << SUIT_COUNT_SHIFT
+SUIT_COUNT_FLUSH = 0x8888 << SUIT_COUNT_SHIFT
+CARD_KEY: Tuple[int, ...] = tuple(RANK_KEY[code] | (1 << (SUIT_COUNT_SHIFT + 4 * (code & 3)))
+                                  for code in range(52))
+
+# tablica wysokosci uzupelnia sie sama przy pierwszym uzyciu danego klucza,
+# build_rank_table() wypelnia ja od razu w calosci (ok. 77 tys. wpisow)
+class RankTable(dict):
+    def __missing__(self, key: int) -> int:
+        ranks = [r + 2 for r in range(13) for _ in range((key >> (3 * r)) & 7)]
+        strength = encode_strength(evaluate_ranks(ranks))
+        self[key] = strength
+        return strength
+
+def build_rank_table(max_cards: int = 7) -> None:
+    for n in range(max_cards + 1):
+        for combo in combinations_with_replacement(range(13), n):
+            if n < 5 or max(Counter(combo).values()) <= 4:
+                RANK_TABLE[sum(RANK_KEY[r * 4] for r in combo)]
+
+def _build_flush_table() -> List[int]:
+    # dla kazdej maski 13 bitow z min. 5 kartami - sila pokera/koloru, reszta 0
+    table = [0] * (1 << 13)
+    for mask in range(1 << 13):
+        if mask.bit_count() >= 5:
+            ranks = [r + 2 for r in range(13) if mask >> r & 1]
+            table[mask] = encode_strength(evaluate_suited(ranks))
+    return table
+
+RANK_TABLE: Dict[int, int] = RankTable()
+FLUSH_TABLE: List[int] = _build_flush_table()
+
+def evaluate_ints(codes: Sequence[int]) -> int:
+    key = sum(map(CARD_KEY.__getitem__, codes))
+    rank_strength = RANK_TABLE[key & RANK_KEY_MASK]
+    # kolor jest rzadki - maske kart jednego koloru liczymy tylko gdy jakis licznik doszedl do 5
+    flush_bits = (key + SUIT_COUNT_BIAS) & SUIT_COUNT_FLUSH
+    if not flush_bits:
+        return rank_strength
+    suit = (flush_bits.bit_length() - SUIT_COUNT_SHIFT - 1) // 4
+    mask = 0
+    for c in codes:
+        if c & 3 == suit:
+            mask |= RANK_BIT[c]
+    return max(FLUSH_TABLE[mask], rank_strength)
+
+def evaluate_strength(cards: Sequence[Card]) -> int:
+    return evaluate_ints(cards_to_ints(cards))
+
+#przeliczam na siłę ręki
+def evaluate(cards: List[Card]) -> Tuple[HandValue, List[int]]:
+    return decode_strength(evaluate_strength(cards))
+
 def best_hand(player: Player, community_cards: List[Card]) -> Tuple[HandValue, List[int]]:
     all_cards = list(player.hand) + community_cards
-    return evaluate(all_cards)
\ No newline at end of file
+    return evaluate(all_cards)
+
+def best_hand_strength(player: Player, community_cards: List[Card]) -> int:
+    return evaluate_ints(cards_to_ints(player.hand) + cards_to_ints(community_cards))
+
+# --- ocena wielu rąk naraz (numpy) ---
+# te same klucze i tablice co evaluate_ints, tylko liczone na całych tablicach
+CARD_KEY_ARRAY = np.array(CARD_KEY, dtype=np.int64)
+RANK_BIT_ARRAY = np.array(RANK_BIT, dtype=np.int64)
+FLUSH_TABLE_ARRAY = np.array(FLUSH_TABLE, dtype=np.int64)
+
+_rank_keys: Optional[np.ndarray] = None
+_rank_values: Optional[np.ndarray] = None
+
+# posortowane klucze tablicy wysokości - wyszukujemy je przez searchsorted
+def _rank_lookup() -> Tuple[np.ndarray, np.ndarray]:
+    global _rank_keys, _rank_values
+    if _rank_keys is None:
+        build_rank_table()
+        keys = np.array(sorted(RANK_TABLE), dtype=np.int64)
+        _rank_values = np.array([RANK_TABLE[int(k)] for k in keys], dtype=np.int64)
+        _rank_keys = keys
+    return _rank_keys, _rank_values
+
+# bity wysokości osobno dla każdego koloru (13 bitów na kolor) - też się sumują,
+# więc maskę koloru dostajemy przesunięciem zamiast przeglądania kart
+SUIT_BIT: List[int] = [1 << (13 * (code & 3) + (code >> 2)) for code in range(52)]
+SUIT_BIT_ARRAY = np.array(SUIT_BIT, dtype=np.int64)
+SUIT_MASK = (1 << 13) - 1
+
+def _strength_from_sums(key: int, suit_bits: int) -> int:
+    rank_strength = RANK_TABLE[key & RANK_KEY_MASK]
+    flush_bits = (key + SUIT_COUNT_BIAS) & SUIT_COUNT_FLUSH
+    if not flush_bits:
+        return rank_strength
+    suit = (flush_bits.bit_length() - SUIT_COUNT_SHIFT - 1) // 4
+    return max(FLUSH_TABLE[(suit_bits >> (13 * suit)) & SUIT_MASK], rank_strength)
+
+def _strengths_from_sums(key: np.ndarray, suit_bits: np.ndarray) -> np.ndarray:
+    keys, values = _rank_lookup()
+    strength = values[np.searchsorted(keys, key & RANK_KEY_MASK)]
+    # kolor odczytujemy z liczników kolorów w kluczu, tablicę kolorów sprawdzamy tylko dla rąk z kolorem
+    flush_bits = ((key + SUIT_COUNT_BIAS) & SUIT_COUNT_FLUSH) >> (SUIT_COUNT_SHIFT + 3)
+    flushed = np.flatnonzero(flush_bits)
+    if len(flushed):
+        bits = flush_bits[flushed]
+        flush_suit = (bits >> 4 & 1) + (bits >> 8 & 1) * 2 + (bits >> 12 & 1) * 3
+        mask = (suit_bits[flushed] >> (13 * flush_suit)) & SUIT_MASK
+        strength[flushed] = np.maximum(strength[flushed], FLUSH_TABLE_ARRAY[mask])
+    return strength
+
+def _as_hands(hands: Union[np.ndarray, Sequence[int], bytes], cards_per_hand: int) -> np.ndarray:
+    hands = np.asarray(hands if not isinstance(hands, (bytes, bytearray)) else np.frombuffer(hands, dtype=np.uint8))
+    if hands.ndim == 1:
+        hands = hands.reshape(-1, cards_per_hand)
+    return hands.astype(np.intp, copy=False)
+
+# hands: tablica (N, k) z kartami 0..51 (dowolny typ całkowity, np. uint8),
+# albo płaski bufor (array, bytes) z cards_per_hand kartami na rękę.
+# zwraca N sił rąk, takich samych jak z evaluate_ints
+def evaluate_many(hands: Union[np.ndarray, Sequence[int], bytes], cards_per_hand: int = 7) -> np.ndarray:
+    hands = _as_hands(hands, cards_per_hand)
+    return _strengths_from_sums(CARD_KEY_ARRAY[hands].sum(axis=1), SUIT_BIT_ARRAY[hands].sum(axis=1))
+
+# --- ocena przyrostowa, ulica po ulicy ---
+# znane karty (ręka, flop) sumujemy raz, każda dołożona karta to dwa dodawania,
+# a ocena to jedno wyszukanie w tablicy wysokości (i w tablicy kolorów przy kolorze)
+class PartialHand:
+    __slots__ = ("key", "suit_bits", "size")
+
+    def __init__(self, codes: Sequence[int] = ()):
+        self.key = sum(map(CARD_KEY.__getitem__, codes))
+        self.suit_bits = sum(map(SUIT_BIT.__getitem__, codes))
+        self.size = len(codes)
+
+    @classmethod
+    def from_cards(cls, cards: Sequence[Card]) -> "PartialHand":
+        return cls(cards_to_ints(cards))
+
+    # nowa ręka z dołożoną kartą, ta zostaje bez zmian
+    def add(self, code: int) -> "PartialHand":
+        hand = PartialHand.__new__(PartialHand)
+        hand.key = self.key + CARD_KEY[code]
+        hand.suit_bits = self.suit_bits + SUIT_BIT[code]
+        hand.size = self.size + 1
+        return hand
+
+    def strength(self) -> int:
+        return _strength_from_sums(self.key, self.suit_bits)
+
+    # siła z dodatkowymi kartami, bez tworzenia nowego obiektu
+    def strength_with(self, *codes: int) -> int:
+        key, suit_bits = self.key, self.suit_bits
+        for c in codes:
+            key += CARD_KEY[c]
+            suit_bits += SUIT_BIT[c]
+        return _strength_from_sums(key, suit_bits)
+
+    # siły dla wielu zestawów dokładanych kart naraz, additions: tablica (N, k)
+    def strength_many(self, additions: Union[np.ndarray, Sequence[int], bytes], cards_per_hand: int = 1) -> np.ndarray:
+        additions = _as_hands(additions, cards_per_hand)
+        return _strengths_from_sums(self.key + CARD_KEY_ARRAY[additions].sum(axis=1),
+                                    self.suit_bits + SUIT_BIT_ARRAY[additions].sum(axis=1))
+
+# kategorie (wartości HandValue) dla tablicy sił
+def hand_values_many(strengths: np.ndarray) -> np.ndarray:
+    return np.asarray(strengths) >> CATEGORY_SHIFT
+
+def category_counts(strengths: np.ndarray) -> Dict[HandValue, int]:
+    counts = np.bincount(hand_values_many(strengths), minlength=len(HandValue) + 1)
+    return {value: int(counts[value]) for value in HandValue}
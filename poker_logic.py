@@ -1,16 +1,38 @@
-from typing import List, Tuple, Callable, Optional
-from random import sample
+from typing import List, Tuple, Callable, Optional, Dict
+import random
 from dataclasses import replace
 from models import Card, Suit, Player, GameState, ActionType, GameEvent
 import poker_evaluator
 import time
 
+# obserwator zdarzeń rozdania - podpinany przez GameState.observers, domyślnie nic nie robi.
+# dostaje same liczby i karty (bez kopii stanu), więc FastState woła te same metody
+class GameObserver:
+    # deck - talia pozostała po rozdaniu kart graczom
+    def on_hand_start(self, names: List[str], chips: List[int], hands: List[Tuple[Card, ...]], deck: List[Card],
+                      dealer_index: int) -> None:
+        pass
+
+    def on_blinds(self, sb_idx: int, sb_amount: int, bb_idx: int, bb_amount: int) -> None:
+        pass
+
+    # amount - ile żetonów gracz dołożył tym ruchem, pot - pula po ruchu
+    def on_action(self, player_idx: int, action: ActionType, amount: int, pot: int) -> None:
+        pass
+
+    def on_table_dealt(self, cards: List[Card]) -> None:
+        pass
+
+    # winnings - wygrana każdego miejsca, strengths - siła ręki graczy z showdownu
+    def on_payouts(self, winnings: List[int], strengths: Dict[int, int]) -> None:
+        pass
+
 # tasowanie rozkładanie
 def create_deck() -> List[Card]:
     return [Card(r, s) for s in Suit for r in range(2, 15)]
 
-def shuffle_deck(deck: List[Card]) -> List[Card]:
-    return sample(deck, len(deck))
+def shuffle_deck(deck: List[Card], rng: Optional[random.Random] = None) -> List[Card]:
+    return (rng or random).sample(deck, len(deck))
 
 def deal_hands(deck: List[Card], players: List[Player]) -> Tuple[List[Player], List[Card]]:
     n = 2
@@ -35,6 +57,8 @@ def deal_table(state: GameState, n: int) -> Tuple[GameState, List[GameEvent]]:
     new_comm = state.community_cards + drawn
 
     new_state = replace(state, deck=new_deck, community_cards=new_comm)
+    for obs in state.observers:
+        obs.on_table_dealt(drawn)
     return new_state, [GameEvent(f"Na stół spadają: {drawn}")]
 
 # Podbijanie, dzielenie kasy
@@ -50,6 +74,9 @@ def post_blinds(state: GameState, sb_amount: int = 10, bb_amount: int = 20) -> T
     if n == 2: # jakby było tylko dwóch graczy to dealer jest też sb
         sb_idx = state.dealer_index
         bb_idx = (state.dealer_index + 1) % n
+    for obs in state.observers:
+        obs.on_hand_start([p.name for p in state.players], [p.chips for p in state.players],
+                          [p.hand for p in state.players], state.deck, state.dealer_index)
     #funkcja pomocnicza do wplacania sb i bb
     def pay_blind(p: Player, amount: int) -> Player:
         actual = min(p.chips, amount)
@@ -70,6 +97,8 @@ def post_blinds(state: GameState, sb_amount: int = 10, bb_amount: int = 20) -> T
     events.append(GameEvent(f"{bb_p.name} wpłaca BB {bb_p.current_bet}"))
 
     added_chips = sb_p.current_bet + bb_p.current_bet
+    for obs in state.observers:
+        obs.on_blinds(sb_idx, sb_p.current_bet, bb_idx, bb_p.current_bet)
     return replace(state, players=new_players, pot=state.pot + added_chips, current_bet=bb_amount), events
 
 # co może zrobić w danej chwili?
@@ -160,11 +189,14 @@ def apply_action(state: GameState, player_idx: int, action: ActionType, raise_am
     ]
 
 
+    for obs in state.observers:
+        obs.on_action(player_idx, action, p_total - player.total_bet_in_hand, new_pot)
+
     state = replace(state, min_raise=new_min_raise)
     return replace(state, players=new_players, pot=new_pot, current_bet=new_current_bet), msg
 #
-def run_betting_round(state: GameState, on_action_callback: Optional[Callable[[GameState, str], None]] = None) -> Tuple[
-    GameState, List[GameEvent]]:
+def run_betting_round(state: GameState, on_action_callback: Optional[Callable[[GameState, str], None]] = None,
+                      action_delay: float = 0.8) -> Tuple[GameState, List[GameEvent]]:
 
     n = len(state.players)
     # ustalenie gracza rozpoczynajacego
@@ -175,61 +207,77 @@ def run_betting_round(state: GameState, on_action_callback: Optional[Callable[[G
     else:
         start_idx = (state.dealer_index + 1) % n
 
-    # rekurencja, sprawdza czy nie koneic
-    def _bet_step(current_state: GameState, actor_ptr: int, players_acted: int, accumulated_events: List[GameEvent]) -> \
-    Tuple[GameState, List[GameEvent]]:
-
-        not_folded = [p for p in current_state.players if not p.folded]
+    # liczniki prowadzone na bieżąco zamiast przeliczania list po każdym ruchu
+    num_not_folded = 0
+    num_active = 0  # nie spasowali i nie są all-in
+    bet_counts: Dict[int, int] = {}  # stawki aktywnych graczy -> ilu graczy ma taką stawkę
+    for p in state.players:
+        if not p.folded:
+            num_not_folded += 1
+            if not p.is_all_in:
+                num_active += 1
+                bet_counts[p.current_bet] = bet_counts.get(p.current_bet, 0) + 1
+
+    events: List[GameEvent] = []
+    actor_ptr = start_idx
+    players_acted = 0
+
+    while True:
         # jeżeli został tylko jeden to koniec i wygrywa rozdanei
-        if len(not_folded) == 1:
-            return current_state, accumulated_events
-
-        active_with_chips = [p for p in current_state.players if not p.folded and not p.is_all_in]
+        if num_not_folded == 1:
+            break
         # sprawdzamy czy wyrównali
-        all_matched = all(p.current_bet == current_state.current_bet for p in not_folded if not p.is_all_in)
+        all_matched = bet_counts.get(state.current_bet, 0) == num_active
         # jesli wyrownali i wykonal kazy ruch to koniec
-        if all_matched and players_acted >= len(active_with_chips):
-            return current_state, accumulated_events
+        if all_matched and players_acted >= num_active:
+            break
         # jak już nie ma komu licytować - np wszyscy all-in
-        if len(active_with_chips) < 2:
-            highest_bet = current_state.current_bet
+        if num_active < 2:
             rich_player_matched = True
-            if active_with_chips:
-                rich_player_matched = (active_with_chips[0].current_bet >= highest_bet)
-
+            if num_active == 1:
+                rich_player_matched = next(iter(bet_counts)) >= state.current_bet
             if rich_player_matched:
-                return current_state, accumulated_events
+                break
         # kto teraz wykonuje ruch?
         current_actor_idx = actor_ptr % n
-        player = current_state.players[current_actor_idx]
+        actor_ptr += 1
+        player = state.players[current_actor_idx]
         # jeżeli zfoldowal lub zagral all in to pomijam
         if player.folded or player.is_all_in:
-            return _bet_step(current_state, actor_ptr + 1, players_acted, accumulated_events)
+            continue
         # pobieramy deccyzje
-        legal = get_legal_actions(player, current_state)
+        legal = get_legal_actions(player, state)
         if player.controller is None:
             action, amount = ActionType.CHECK, 0
         else:
-            action, amount = player.controller.decide_action(player, current_state, legal)
+            action, amount = player.controller.decide_action(player, state, legal)
+
+        prev_bet = state.current_bet
+        state, msg = apply_action(state, current_actor_idx, action, amount)
+        events.append(GameEvent(msg))
+
+        # aktualizacja liczników - zmienił się tylko ten jeden gracz
+        bet_counts[player.current_bet] -= 1
+        if bet_counts[player.current_bet] == 0:
+            del bet_counts[player.current_bet]
+        num_active -= 1
+        new_p = state.players[current_actor_idx]
+        if new_p.folded:
+            num_not_folded -= 1
+        elif not new_p.is_all_in:
+            num_active += 1
+            bet_counts[new_p.current_bet] = bet_counts.get(new_p.current_bet, 0) + 1
 
-        prev_bet = current_state.current_bet
-        new_state, msg = apply_action(current_state, current_actor_idx, action, amount)
         # odświeżenie grafiki
         if on_action_callback:
-            on_action_callback(new_state, msg)
-            time.sleep(0.8)
+            on_action_callback(state, msg)
+            if action_delay > 0:
+                time.sleep(action_delay)
         # jak ktoś przebije to gramy dalej
-        did_raise = new_state.current_bet > prev_bet
-        next_players_acted = 1 if did_raise else players_acted + 1
-
-        return _bet_step(
-            current_state=new_state,
-            actor_ptr=actor_ptr + 1,
-            players_acted=next_players_acted,
-            accumulated_events=accumulated_events + [GameEvent(msg)]
-        )
+        did_raise = state.current_bet > prev_bet
+        players_acted = 1 if did_raise else players_acted + 1
 
-    return _bet_step(state, start_idx, 0, [])
+    return state, events
 
 
 def reset_bets(state: GameState) -> GameState:
@@ -237,58 +285,61 @@ def reset_bets(state: GameState) -> GameState:
     return replace(state, players=new_players, current_bet=0, min_raise=20)
 
 # funkcja do podzialu kasy
+# każdą rękę z showdownu oceniamy raz, potem jednym przejściem po graczach posortowanych
+# malejąco po wpłatach budujemy wszystkie pule (od najwyższego poziomu w dół - zwycięzcy
+# niższej puli to najlepsi spośród wszystkich, którzy do niej dopłacili)
 def resolve_payouts(state: GameState) -> Tuple[GameState, List[GameEvent]]:
     events = [GameEvent("Rozliczenie")]
     players = state.players
-    # lista kwot które wpłacili gracze zeby policzyć dobrze sidepoty
-    all_bets = sorted(list(set(p.total_bet_in_hand for p in players if p.total_bet_in_hand > 0)))
-    temp_chips = {i: p.chips for i, p in enumerate(players)}
-    last_bet_level = 0
-
-    for bet_level in all_bets:
-        chunk_size = bet_level - last_bet_level
-        pot_chunk = 0
-        contributors_indices = []
-
-        for i, p in enumerate(players):
-            if p.total_bet_in_hand >= bet_level:
-                pot_chunk += chunk_size
-                if not p.folded: contributors_indices.append(i)
-            elif p.total_bet_in_hand > last_bet_level:
-                pot_chunk += (p.total_bet_in_hand - last_bet_level)
-
-        if pot_chunk == 0:
-            last_bet_level = bet_level
+    n = len(players)
+    board = poker_evaluator.PartialHand.from_cards(state.community_cards)
+    strengths: Dict[int, int] = {
+        i: board.strength_with(*poker_evaluator.cards_to_ints(p.hand))
+        for i, p in enumerate(players) if not p.folded and p.total_bet_in_hand > 0
+    }
+    order = sorted(range(n), key=lambda i: players[i].total_bet_in_hand, reverse=True)
+
+    pots = []  # (wielkość puli, zwycięzcy po numerach miejsc, siła zwycięskiej ręki)
+    best_score = -1
+    winners: List[int] = []
+    k = 0
+    while k < n and players[order[k]].total_bet_in_hand > 0:
+        bet_level = players[order[k]].total_bet_in_hand
+        # dochodzą gracze, którzy wpłacili dokładnie tyle
+        while k < n and players[order[k]].total_bet_in_hand == bet_level:
+            idx = order[k]
+            score = strengths.get(idx)
+            if score is not None:
+                if score > best_score:
+                    best_score = score
+                    winners = [idx]
+                elif score == best_score:
+                    winners.append(idx)
+            k += 1
+        next_level = players[order[k]].total_bet_in_hand if k < n else 0
+        # k graczy wpłaciło co najmniej bet_level
+        pots.append(((bet_level - next_level) * k, sorted(winners), best_score))
+
+    temp_chips = [p.chips for p in players]
+    for pot_chunk, pot_winners, score in reversed(pots):
+        # pula bez nikogo w grze (wszyscy, którzy do niej dopłacili, spasowali)
+        if not pot_winners:
             continue
 
-        candidates = [players[i] for i in contributors_indices]
-        if not candidates:
-            last_bet_level = bet_level
-            continue
-        # wyłaniamy zwycięzce
-        cand_scores = []
-        for p in candidates:
-            score = poker_evaluator.best_hand(p, state.community_cards)
-            cand_scores.append((p, score))
-
-        best_score_entry = max(cand_scores, key=lambda x: x[1])
-        best_score_val = best_score_entry[1]
-        winners = [p for p, s in cand_scores if s == best_score_val]
-
-        win_amount = pot_chunk // len(winners)
-        extra = pot_chunk % len(winners)
+        win_amount = pot_chunk // len(pot_winners)
+        extra = pot_chunk % len(pot_winners)
 
-        hand_name = best_score_val[0].name
+        hand_name = poker_evaluator.hand_value(score).name
         events.append(
-            GameEvent(f"Pula {pot_chunk} dla: {[w.name for w in winners]} ({hand_name})"))
+            GameEvent(f"Pula {pot_chunk} dla: {[players[i].name for i in pot_winners]} ({hand_name})"))
 
-        for w in winners:
-            w_idx = next(i for i, p in enumerate(players) if p.name == w.name)
+        for w_idx in pot_winners:
             bonus = 1 if extra > 0 else 0
             if bonus: extra -= 1
             temp_chips[w_idx] += (win_amount + bonus)
 
-        last_bet_level = bet_level
+    for obs in state.observers:
+        obs.on_payouts([temp_chips[i] - p.chips for i, p in enumerate(players)], strengths)
 
     new_players_list = []
     for i, p in enumerate(players):
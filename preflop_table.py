@@ -0,0 +1,103 @@
+import argparse
+import os
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence
+import numpy as np
+from models import Card, Suit
+import poker_equity
+
+# tabela equity all-in przed flopem: 169 klas rąk startowych x 1..9 losowych przeciwników
+# plik liczy się raz (python preflop_table.py), potem tylko go wczytujemy
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "preflop_equity.bin")
+MAGIC = b"PFEQ"
+NUM_CLASSES = 169
+MAX_OPPONENTS = 9
+SCALE = 65535  # equity zapisane jako uint16
+
+# klasa ręki jako pole siatki 13x13: para na przekątnej, kolorowe nad nią, niekolorowe pod nią
+def hand_class(hand: Sequence[Card]) -> int:
+    high, low = sorted((hand[0].rank - 2, hand[1].rank - 2), reverse=True)
+    if hand[0].suit == hand[1].suit:
+        return high * 13 + low
+    return low * 13 + high
+
+def class_hand(index: int) -> List[Card]:
+    row, col = divmod(index, 13)
+    if row > col:  # kolorowe
+        return [Card(row + 2, Suit.HEARTS), Card(col + 2, Suit.HEARTS)]
+    return [Card(col + 2, Suit.HEARTS), Card(row + 2, Suit.SPADES)]
+
+def class_name(index: int) -> str:
+    names = "23456789TJQKA"
+    row, col = divmod(index, 13)
+    if row == col:
+        return names[row] * 2
+    if row > col:
+        return names[row] + names[col] + "s"
+    return names[col] + names[row] + "o"
+
+def _class_equities(index: int, iterations: int, seed: int) -> List[float]:
+    rng = np.random.default_rng(seed)
+    hand = class_hand(index)
+    return [poker_equity.monte_carlo_equity(hand, [], iterations, rng, num_opponents=n)
+            for n in range(1, MAX_OPPONENTS + 1)]
+
+# liczenie równoległe - każda klasa ma własny seed, więc wynik nie zależy od liczby procesów
+def generate_table(iterations: int = 20000, seed: int = 0, workers: Optional[int] = None) -> array:
+    seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(NUM_CLASSES)]
+    table = array("H", [0] * (NUM_CLASSES * MAX_OPPONENTS))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(_class_equities, range(NUM_CLASSES), [iterations] * NUM_CLASSES, seeds)
+        for index, equities in enumerate(results):
+            for n, eq in enumerate(equities):
+                table[n * NUM_CLASSES + index] = round(eq * SCALE)
+    return table
+
+def save_table(table: array, path: str = TABLE_PATH) -> None:
+    data = array("H", table)
+    if sys.byteorder != "little":
+        data.byteswap()
+    with open(path, "wb") as f:
+        f.write(MAGIC + bytes([MAX_OPPONENTS]))
+        f.write(data.tobytes())
+
+def load_table(path: str = TABLE_PATH) -> Optional[array]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        raw = f.read()
+    if raw[:4] != MAGIC or raw[4] != MAX_OPPONENTS:
+        return None
+    table = array("H")
+    table.frombytes(raw[5:])
+    if sys.byteorder != "little":
+        table.byteswap()
+    return table if len(table) == NUM_CLASSES * MAX_OPPONENTS else None
+
+TABLE: Optional[array] = load_table()
+
+# equity ręki przeciwko n losowym rękom, None gdy nie ma pliku z tabelą
+def lookup(hand: Sequence[Card], num_opponents: int) -> Optional[float]:
+    if TABLE is None:
+        return None
+    n = max(1, min(num_opponents, MAX_OPPONENTS))
+    return TABLE[(n - 1) * NUM_CLASSES + hand_class(hand)] / SCALE
+
+def main():
+    parser = argparse.ArgumentParser(description="Generowanie tabeli equity przed flopem")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default=TABLE_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    table = generate_table(args.iterations, args.seed, args.workers)
+    save_table(table, args.out)
+    print(f"Zapisano {args.out} ({time.perf_counter() - start:.1f} s)")
+
+if __name__ == "__main__":
+    main()
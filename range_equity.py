@@ -0,0 +1,198 @@
+import argparse
+from itertools import combinations
+from math import comb
+from typing import List, Sequence, Optional, Dict, Union
+import numpy as np
+from models import Card, Suit
+import poker_evaluator
+import preflop_table
+
+# equity zakresów rąk: każdy gracz ma wagi dla wszystkich 1326 par kart (zakres),
+# stała ręka to zakres z jedną parą. karty, które się wykluczają (ze stołem albo między graczami),
+# odsiewamy maskami bitowymi na całych tablicach naraz
+NUM_COMBOS = 1326
+COMBOS = np.array(list(combinations(range(52), 2)), dtype=np.int64)
+COMBO_MASKS = (np.int64(1) << COMBOS[:, 0]) | (np.int64(1) << COMBOS[:, 1])
+_COMBO_INDEX = {(int(a), int(b)): i for i, (a, b) in enumerate(COMBOS)}
+
+# klasa 0..168 każdej pary, tak jak preflop_table.hand_class
+def _combo_class(a: int, b: int) -> int:
+    high, low = sorted((a >> 2, b >> 2), reverse=True)
+    if a & 3 == b & 3:
+        return high * 13 + low
+    return low * 13 + high
+
+COMBO_CLASSES = np.array([_combo_class(int(a), int(b)) for a, b in COMBOS], dtype=np.int64)
+CLASS_COMBOS = np.bincount(COMBO_CLASSES, minlength=preflop_table.NUM_CLASSES)  # 6 par, 4 kolorowe, 12 niekolorowych
+_CLASS_NAMES = {preflop_table.class_name(i): i for i in range(preflop_table.NUM_CLASSES)}
+
+def card_mask(cards: Sequence[Card]) -> int:
+    mask = 0
+    for c in poker_evaluator.cards_to_ints(cards):
+        mask |= 1 << c
+    return mask
+
+def hand_range(hand: Sequence[Card]) -> np.ndarray:
+    a, b = sorted(poker_evaluator.cards_to_ints(hand))
+    weights = np.zeros(NUM_COMBOS)
+    weights[_COMBO_INDEX[(a, b)]] = 1.0
+    return weights
+
+# wagi dla klas rąk: 169 liczb (kolejność jak w preflop_table) albo słownik {"AKs": 1.0, "72o": 0.5, ...}
+def class_range(weights: Union[Sequence[float], Dict[str, float]]) -> np.ndarray:
+    class_weights = np.zeros(preflop_table.NUM_CLASSES)
+    if isinstance(weights, dict):
+        for name, w in weights.items():
+            if name not in _CLASS_NAMES:
+                raise ValueError(f"Nieznana klasa ręki: {name}")
+            class_weights[_CLASS_NAMES[name]] = w
+    else:
+        class_weights[:] = weights
+    return class_weights[COMBO_CLASSES]
+
+# siła klas do układania zakresów "top X%": equity z tabeli przed flopem przeciwko jednej ręce,
+# bez tabeli - przybliżenie z wysokości kart, pary i koloru
+def _class_order() -> np.ndarray:
+    if preflop_table.TABLE is not None:
+        strength = np.array(preflop_table.TABLE[:preflop_table.NUM_CLASSES], dtype=np.float64)
+    else:
+        row, col = np.divmod(np.arange(preflop_table.NUM_CLASSES), 13)
+        high, low = np.maximum(row, col), np.minimum(row, col)
+        strength = 2.0 * high + low + 20.0 * (row == col) + 2.0 * (row > col)
+    return np.argsort(-strength, kind="stable")
+
+# najlepsze `percent` procent wszystkich par kart; ostatnia klasa wchodzi częściowo, żeby trafić dokładnie
+def top_range(percent: float) -> np.ndarray:
+    target = NUM_COMBOS * min(max(percent, 0.0), 100.0) / 100.0
+    class_weights = np.zeros(preflop_table.NUM_CLASSES)
+    taken = 0.0
+    for c in _class_order():
+        if taken >= target:
+            break
+        part = min(1.0, (target - taken) / CLASS_COMBOS[c])
+        class_weights[c] = part
+        taken += part * CLASS_COMBOS[c]
+    return class_weights[COMBO_CLASSES]
+
+# zapis tekstowy: "top 15%" albo lista klas z opcjonalną wagą, np. "AA,KK,AKs,AQs:0.5"
+def parse_range(text: str) -> np.ndarray:
+    text = text.strip()
+    if text.lower().startswith("top"):
+        return top_range(float(text[3:].strip().rstrip("%")))
+    weights: Dict[str, float] = {}
+    for part in text.split(","):
+        name, _, w = part.strip().partition(":")
+        weights[name] = float(w) if w else 1.0
+    return class_range(weights)
+
+# dokładnie dla dwóch graczy, gdy par rąk razy dokończeń stołu jest mało (np. ręka przeciw zakresowi na turnie)
+def _exact_heads_up(ranges: List[np.ndarray], board: List[int], board_mask: int) -> np.ndarray:
+    first, second = (np.flatnonzero(r) for r in ranges)
+    i, j = np.meshgrid(first, second, indexing="ij")
+    i, j = i.ravel(), j.ravel()
+    ok = (COMBO_MASKS[i] & COMBO_MASKS[j]) == 0
+    i, j = i[ok], j[ok]
+    pair_masks = COMBO_MASKS[i] | COMBO_MASKS[j]
+
+    deck = np.array([c for c in range(52) if not board_mask >> c & 1], dtype=np.int64)
+    cards_needed = 5 - len(board)
+    runouts = list(combinations(deck, cards_needed))
+    runouts = np.array(runouts, dtype=np.int64).reshape(len(runouts), cards_needed)
+    runout_masks = (np.int64(1) << runouts).sum(axis=1)
+    pair_idx, runout_idx = np.nonzero((pair_masks[:, None] & runout_masks[None, :]) == 0)
+
+    base = poker_evaluator.PartialHand(board)
+    runout_cards = runouts[runout_idx]
+    s1 = base.strength_many(np.concatenate([COMBOS[i[pair_idx]], runout_cards], axis=1))
+    s2 = base.strength_many(np.concatenate([COMBOS[j[pair_idx]], runout_cards], axis=1))
+    weight = ranges[0][i[pair_idx]] * ranges[1][j[pair_idx]]
+    share1 = np.where(s1 > s2, 1.0, np.where(s1 == s2, 0.5, 0.0))
+    eq1 = (weight * share1).sum() / weight.sum()
+    return np.array([eq1, 1.0 - eq1])
+
+# monte carlo: ręce losujemy z wag zakresów, wiersze z kolizjami kart odrzucamy w całości
+# (to daje poprawny rozkład łączny), brakujące karty stołu losujemy spośród niewykorzystanych
+def _monte_carlo(ranges: List[np.ndarray], board: List[int], board_mask: int, iterations: int,
+                 rng: np.random.Generator) -> np.ndarray:
+    probs = [r / r.sum() for r in ranges]
+    holes: List[np.ndarray] = []
+    masks = np.zeros(0, dtype=np.int64)
+    attempts = 0
+    while len(masks) < iterations:
+        attempts += 1
+        if attempts > 50:
+            raise ValueError("Zakresy prawie całkowicie się wykluczają")
+        batch = 2 * (iterations - len(masks)) + 64
+        picks = np.stack([rng.choice(NUM_COMBOS, size=batch, p=p) for p in probs], axis=1)
+        used = np.zeros(batch, dtype=np.int64)
+        ok = np.ones(batch, dtype=bool)
+        for k in range(len(ranges)):
+            m = COMBO_MASKS[picks[:, k]]
+            ok &= (used & m) == 0
+            used |= m
+        holes.append(picks[ok])
+        masks = np.concatenate([masks, used[ok]])
+    picks = np.concatenate(holes)[:iterations]
+    masks = masks[:iterations] | board_mask
+
+    cards_needed = 5 - len(board)
+    if cards_needed:
+        dead = ((masks[:, None] >> np.arange(52)) & 1).astype(bool)
+        keys = rng.random((iterations, 52))
+        keys[dead] = 2.0
+        runouts = np.argpartition(keys, cards_needed - 1, axis=1)[:, :cards_needed]
+    else:
+        runouts = np.zeros((iterations, 0), dtype=np.int64)
+
+    base = poker_evaluator.PartialHand(board)
+    strengths = np.stack([base.strength_many(np.concatenate([COMBOS[picks[:, k]], runouts], axis=1))
+                          for k in range(len(ranges))], axis=1)
+    winners = strengths == strengths.max(axis=1)[:, None]
+    return (winners / winners.sum(axis=1)[:, None]).mean(axis=0)
+
+# equity każdego z graczy (ręka albo zakres) przy danym, także niepełnym stole
+def range_equity(ranges: Sequence[np.ndarray], community_cards: Sequence[Card] = (), iterations: int = 2000,
+                 rng: Optional[np.random.Generator] = None, max_exact: int = 200000) -> List[float]:
+    if len(ranges) < 2:
+        raise ValueError("Potrzeba co najmniej dwóch zakresów")
+    if rng is None:
+        rng = np.random.default_rng()
+    board = poker_evaluator.cards_to_ints(community_cards)
+    board_mask = card_mask(community_cards)
+    # usuwamy pary kolidujące ze stołem
+    blocked = (COMBO_MASKS & board_mask) != 0
+    ranges = [np.where(blocked, 0.0, np.asarray(r, dtype=np.float64)) for r in ranges]
+    if any(r.sum() <= 0 for r in ranges):
+        raise ValueError("Pusty zakres (po usunięciu kart ze stołu)")
+
+    if len(ranges) == 2:
+        runouts = comb(52 - len(board) - 4, 5 - len(board))
+        if np.count_nonzero(ranges[0]) * np.count_nonzero(ranges[1]) * runouts <= max_exact:
+            return [float(e) for e in _exact_heads_up(ranges, board, board_mask)]
+    return [float(e) for e in _monte_carlo(ranges, board, board_mask, iterations, rng)]
+
+# karty w zapisie tekstowym, np. "AhKd" albo "Ah7d2c"
+RANKS = {r: i + 2 for i, r in enumerate("23456789TJQKA")}
+SUITS = {"h": Suit.HEARTS, "d": Suit.DIAMONDS, "s": Suit.SPADES, "c": Suit.CLUBS}
+
+def parse_cards(text: str) -> List[Card]:
+    return [Card(RANKS[text[i].upper()], SUITS[text[i + 1]]) for i in range(0, len(text), 2)]
+
+def _looks_like_hand(text: str) -> bool:
+    return len(text) == 4 and text[1] in SUITS and text[3] in SUITS
+
+def main():
+    parser = argparse.ArgumentParser(description="Equity zakresów rąk")
+    parser.add_argument("ranges", nargs="+", help='ręka "AhKd", zakres "top 15%%" albo "AA,KK,AKs:0.5"')
+    parser.add_argument("--board", default="", help='np. "Ah7d2c"')
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    ranges = [hand_range(parse_cards(r)) if _looks_like_hand(r) else parse_range(r) for r in args.ranges]
+    result = range_equity(ranges, parse_cards(args.board), args.iterations, np.random.default_rng(args.seed))
+    for text, eq in zip(args.ranges, result):
+        print(f"{text:30s} {eq:7.2%}")
+
+if __name__ == "__main__":
+    main()
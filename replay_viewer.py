@@ -0,0 +1,63 @@
+import sys
+import pygame
+from hand_replay import ReplayReader
+from gui_renderer import PokerGUI, SCREEN_WIDTH, SCREEN_HEIGHT
+
+# przeglądanie zapisanych rozdań w GUI: strzałki lewo/prawo - decyzje, góra/dół - rozdania
+# rozdania wczytujemy dopiero gdy są potrzebne, przez indeks pliku
+def main():
+    if len(sys.argv) < 2:
+        print("Użycie: python replay_viewer.py PLIK [NUMER_ROZDANIA]")
+        return
+
+    reader = ReplayReader(sys.argv[1])
+    hand_no = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    if not 1 <= hand_no <= len(reader):
+        print(f"Brak rozdania #{hand_no} - plik ma rozdania od 1 do {len(reader)}")
+        reader.close()
+        return
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Poker Replay")
+    clock = pygame.time.Clock()
+    gui = PokerGUI(screen)
+
+    timeline = reader.hand(hand_no).replay()
+    step = 0
+    running = True
+
+    while running:
+        clock.tick(30)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_RIGHT:
+                    step = min(step + 1, len(timeline) - 1)
+                elif event.key == pygame.K_LEFT:
+                    step = max(step - 1, 0)
+                elif event.key in (pygame.K_UP, pygame.K_DOWN):
+                    new_no = hand_no + (1 if event.key == pygame.K_UP else -1)
+                    if 1 <= new_no <= len(reader):
+                        hand_no = new_no
+                        timeline = reader.hand(hand_no).replay()
+                        step = 0
+
+        state, msg = timeline[step]
+        logs = [f"ROZDANIE #{hand_no} ---"] + [m for _, m in timeline[:step + 1]]
+        gui.render(
+            state=state,
+            human_msg=f"#{hand_no} ({step + 1}/{len(timeline)}): {msg}",
+            legal_actions=[],
+            waiting_for_human=False,
+            current_actor_idx=-1,
+            show_all_cards=True,
+            game_logs=logs
+        )
+
+    reader.close()
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
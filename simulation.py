@@ -0,0 +1,172 @@
+import argparse
+import time
+import numpy as np
+from dataclasses import dataclass, field
+from typing import List, Tuple, Dict, Optional, Callable, Any
+import poker_logic
+from models import Player, GameState, GameEvent, Card
+from controllers import SmartBotController
+from poker_equity import EquityCache
+from fast_state import FastState
+from dealer import Dealer
+from hand_history import HandHistoryWriter
+from hand_stats import HandStats
+import instrumentation
+
+# tryb bez GUI - same boty, bez pygame, bez opóźnień i bez globalnego GameContext
+
+@dataclass
+class SimulationResult:
+    hands: int = 0
+    sessions: int = 0
+    seconds: float = 0.0
+    chip_deltas: Dict[str, int] = field(default_factory=dict)  # zysk/strata na gracza po wszystkich sesjach
+    showdowns: int = 0
+    showdowns_won: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def hands_per_second(self) -> float:
+        return self.hands / self.seconds if self.seconds > 0 else 0.0
+
+    # dokładanie wyników innej części symulacji (np. z innego procesu)
+    def merge(self, other: "SimulationResult") -> None:
+        self.hands += other.hands
+        self.sessions += other.sessions
+        self.seconds += other.seconds
+        self.showdowns += other.showdowns
+        for name, delta in other.chip_deltas.items():
+            self.chip_deltas[name] = self.chip_deltas.get(name, 0) + delta
+        for name, won in other.showdowns_won.items():
+            self.showdowns_won[name] = self.showdowns_won.get(name, 0) + won
+
+# cache equity podajemy z zewnątrz, żeby był wspólny dla kolejnych sesji tej samej symulacji (stołu)
+def make_bot_players(num_players: int, chips: int = 1000,
+                     seed_seq: Optional[np.random.SeedSequence] = None,
+                     cache: Optional[EquityCache] = None) -> List[Player]:
+    seeds = seed_seq.spawn(num_players) if seed_seq is not None else [None] * num_players
+    cache = cache if cache is not None else EquityCache()
+    return [Player(name=f"Bot {i + 1}", chips=chips, hand=(),
+                   controller=SmartBotController(rng=np.random.default_rng(seeds[i]), cache=cache))
+            for i in range(num_players)]
+
+# rozdanie aż do showdownu, bez rozliczenia puli - na szybkim stanie FastState zmienianym w miejscu
+def play_streets(players: List[Player], dealer_idx: int,
+                 on_action_callback: Optional[Callable[[GameState, str], None]] = None,
+                 observers: Tuple[Any, ...] = (), deck: Optional[List[Card]] = None) -> Tuple[GameState, List[GameEvent]]:
+    if deck is None:
+        deck = poker_logic.shuffle_deck(poker_logic.create_deck())
+    fast = FastState(players, deck=[], community_cards=[], dealer_index=dealer_idx, observers=observers)
+    fast.deal_hands(deck)
+
+    events = fast.post_blinds()
+    events += fast.run_betting_round(on_action_callback)
+
+    for n in (3, 1, 1):  # flop, turn, river
+        if fast.folded.count(False) < 2:
+            break
+        fast.reset_bets()
+        events += fast.deal_table(n)
+        events += fast.run_betting_round(on_action_callback)
+
+    return fast.to_game_state(), events
+
+# jedno rozdanie od rozdania kart do rozliczenia, ta sama kolejność co w main.game_logic_thread
+def play_hand(players: List[Player], dealer_idx: int,
+              on_action_callback: Optional[Callable[[GameState, str], None]] = None,
+              observers: Tuple[Any, ...] = (), deck: Optional[List[Card]] = None) -> Tuple[GameState, List[GameEvent]]:
+    state, events = play_streets(players, dealer_idx, on_action_callback, observers, deck)
+    state, payout_events = poker_logic.resolve_payouts(state)
+    return state, events + payout_events
+
+# gra sesjami: gdy zostanie jeden gracz z żetonami, stawiamy nowy stół z pełnymi stackami
+# ten sam seed daje dokładnie te same rozdania i decyzje botów
+def run_simulation(num_hands: int, num_players: int = 6, chips: int = 1000,
+                   seed: Optional[int] = None, history_path: Optional[str] = None,
+                   observers: Tuple[Any, ...] = ()) -> SimulationResult:
+    if history_path is not None:
+        with HandHistoryWriter(history_path) as writer:
+            return _run_simulation(num_hands, num_players, chips, seed, observers + (writer,))
+    return _run_simulation(num_hands, num_players, chips, seed, observers)
+
+def _run_simulation(num_hands: int, num_players: int, chips: int, seed: Optional[int],
+                    observers: Tuple[Any, ...]) -> SimulationResult:
+    seed_seq = np.random.SeedSequence(seed)
+    dealer = Dealer.from_seed_sequence(seed_seq.spawn(1)[0])
+    result = SimulationResult()
+    cache = EquityCache()
+    players = make_bot_players(num_players, chips, seed_seq, cache)
+    result.chip_deltas = {p.name: 0 for p in players}
+    result.showdowns_won = {p.name: 0 for p in players}
+    dealer_idx = 0
+    start = time.perf_counter()
+
+    while result.hands < num_hands:
+        active_players = [p for p in players if p.chips > 0]
+        if len(active_players) < 2:
+            for p in players:
+                result.chip_deltas[p.name] += p.chips - chips
+            result.sessions += 1
+            players = make_bot_players(num_players, chips, seed_seq, cache)
+            dealer_idx = 0
+            continue
+
+        dealer_idx = dealer_idx % len(active_players)
+        state, _ = play_streets(active_players, dealer_idx, observers=observers,
+                                deck=dealer.deal_hand(len(active_players)))
+        in_showdown = [p for p in state.players if not p.folded]
+        chips_before = {p.name: p.chips for p in in_showdown}
+        state, _ = poker_logic.resolve_payouts(state)
+
+        if len(in_showdown) > 1:
+            result.showdowns += 1
+            for p in state.players:
+                if p.name in chips_before and p.chips > chips_before[p.name]:
+                    result.showdowns_won[p.name] += 1
+
+        # gracze bez żetonów zostają na liście do rozliczenia sesji
+        by_name = {p.name: p for p in state.players}
+        players = [by_name.get(p.name, p) for p in players]
+        dealer_idx += 1
+        result.hands += 1
+
+    for p in players:
+        result.chip_deltas[p.name] += p.chips - chips
+    result.sessions += 1
+    result.seconds = time.perf_counter() - start
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Symulacja pokera bez GUI")
+    parser.add_argument("--hands", type=int, default=1000)
+    parser.add_argument("--players", type=int, default=6)
+    parser.add_argument("--chips", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--history", default=None, help="plik na binarną historię rozdań")
+    parser.add_argument("--instrument", choices=["text", "json"], default=None, help="pomiary czasu faz gry")
+    parser.add_argument("--stats", default=None, help="plik JSON na statystyki (bb/100, VPIP/PFR, showdowny)")
+    parser.add_argument("--stats-every", type=int, default=10000, help="co ile rozdań zapisywać statystyki")
+    args = parser.parse_args()
+    if args.stats_every < 1:
+        parser.error("--stats-every musi być dodatnie")
+
+    if args.instrument:
+        instrumentation.enable()
+
+    stats = HandStats(snapshot_path=args.stats, snapshot_every=args.stats_every) if args.stats else None
+    result = run_simulation(args.hands, args.players, args.chips, args.seed, args.history,
+                            observers=(stats,) if stats else ())
+    print(f"Rozdania: {result.hands}, sesje: {result.sessions}, czas: {result.seconds:.2f} s")
+    print(f"Showdowny: {result.showdowns}")
+    print(f"Rozdań na sekundę: {result.hands_per_second:.1f}")
+    for name, delta in result.chip_deltas.items():
+        print(f"{name}: {delta:+d}")
+    if stats:
+        stats.save(args.stats)
+        print(stats.summary_text())
+    if args.instrument == "text":
+        print(instrumentation.snapshot_text())
+    elif args.instrument == "json":
+        print(instrumentation.snapshot_json())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import List, Optional, Callable
+import numpy as np
+import simulation
+from simulation import SimulationResult
+
+# rozdzielanie symulacji na wszystkie rdzenie - każda część (shard) ma własny seed,
+# więc dowolną część można odtworzyć wywołując run_shard z tym samym seedem.
+# liczba części nie zależy od liczby rdzeni - ten sam seed daje ten sam wynik na każdej maszynie
+DEFAULT_SHARDS = 64
+
+@dataclass(frozen=True)
+class Shard:
+    index: int
+    seed: int
+    hands: int
+
+@dataclass
+class FarmResult:
+    total: SimulationResult
+    shards: List[Shard] = field(default_factory=list)
+    wall_seconds: float = 0.0
+
+    @property
+    def hands_per_second(self) -> float:
+        return self.total.hands / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+# seedy części wyprowadzone deterministycznie z jednego seeda bazowego
+def make_shards(num_hands: int, num_shards: int, seed: int) -> List[Shard]:
+    children = np.random.SeedSequence(seed).spawn(num_shards)
+    base, extra = divmod(num_hands, num_shards)
+    return [Shard(index=i, seed=int(child.generate_state(1)[0]), hands=base + (1 if i < extra else 0))
+            for i, child in enumerate(children)]
+
+def run_shard(shard: Shard, num_players: int = 6, chips: int = 1000) -> SimulationResult:
+    return simulation.run_simulation(shard.hands, num_players, chips, seed=shard.seed)
+
+def run_farm(num_hands: int, num_players: int = 6, chips: int = 1000, seed: int = 0,
+             num_shards: Optional[int] = None, workers: Optional[int] = None,
+             on_partial: Optional[Callable[[Shard, SimulationResult, SimulationResult], None]] = None) -> FarmResult:
+    workers = workers or os.cpu_count() or 1
+    num_shards = num_shards or DEFAULT_SHARDS
+    shards = [s for s in make_shards(num_hands, num_shards, seed) if s.hands > 0]
+    result = FarmResult(total=SimulationResult(), shards=shards)
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_shard, s, num_players, chips): s for s in shards}
+        # wyniki częściowe scalamy od razu, w kolejności zakończenia
+        for future in as_completed(futures):
+            partial = future.result()
+            result.total.merge(partial)
+            if on_partial:
+                on_partial(futures[future], partial, result.total)
+
+    result.wall_seconds = time.perf_counter() - start
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Równoległa symulacja pokera na wielu procesach")
+    parser.add_argument("--hands", type=int, default=10000)
+    parser.add_argument("--players", type=int, default=6)
+    parser.add_argument("--chips", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--shards", type=int, default=DEFAULT_SHARDS, help="liczba części (wynik zależy od niej, nie od --workers)")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    def report(shard: Shard, partial: SimulationResult, total: SimulationResult):
+        print(f"Część {shard.index} (seed {shard.seed}): {partial.hands} rozdań, razem {total.hands}")
+
+    result = run_farm(args.hands, args.players, args.chips, args.seed, args.shards, args.workers, report)
+    print(f"Rozdania: {result.total.hands}, sesje: {result.total.sessions}, showdowny: {result.total.showdowns}")
+    print(f"Czas: {result.wall_seconds:.2f} s, rozdań na sekundę: {result.hands_per_second:.1f}")
+    for name, delta in result.total.chip_deltas.items():
+        print(f"{name}: {delta:+d} (wygrane showdowny: {result.total.showdowns_won.get(name, 0)})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Tuple, Any, Callable
+import numpy as np
+from async_table import AsyncTable, DEFAULT_TIMEOUT
+from dealer import Dealer
+from poker_equity import EquityCache
+from hand_stats import HandStats
+import simulation
+
+# wiele niezależnych stołów botów w jednym procesie i jednej pętli asyncio.
+# każdy stół ma własnych graczy, stan, dealera i licznik rozdań; stoły przeplatają się
+# po każdej decyzji, więc setki stołów nie potrzebują setek wątków.
+# obserwatorzy mają stan bieżącego rozdania, więc każdy stół dostaje własnych z observers_factory(table_id),
+# a wyniki łączy się po grze (np. HandStats.merge)
+
+@dataclass
+class TableStats:
+    table_id: int
+    hands: int = 0
+    sessions: int = 0
+    decisions: int = 0
+    showdowns: int = 0
+    timeouts: int = 0
+    seconds: float = 0.0           # czas gry tego stołu (od startu do końca jego rozdań)
+    decision_seconds: float = 0.0  # z tego czas oczekiwania na decyzje graczy przy tym stole
+
+    @property
+    def hands_per_second(self) -> float:
+        return self.hands / self.seconds if self.seconds > 0 else 0.0
+
+class TableManager:
+    def __init__(self, players_per_table: int = 6, chips: int = 1000, seed: Optional[int] = None,
+                 decision_timeout: float = DEFAULT_TIMEOUT,
+                 observers_factory: Optional[Callable[[int], Tuple[Any, ...]]] = None, blocking: bool = False):
+        self.players_per_table = players_per_table
+        self.blocking = blocking  # patrz async_table.SyncControllerAdapter
+        self.chips = chips
+        self.decision_timeout = decision_timeout
+        self.observers_factory = observers_factory
+        self.observers: Dict[int, Tuple[Any, ...]] = {}
+        self._seed_seq = np.random.SeedSequence(seed)
+        self.tables: Dict[int, AsyncTable] = {}
+        self._table_seeds: Dict[int, np.random.SeedSequence] = {}
+        self._caches: Dict[int, EquityCache] = {}  # cache equity osobno na stół, żeby stoły nie wpływały na siebie
+        self.sessions: Dict[int, int] = {}
+        self._elapsed: Dict[int, float] = {}  # czas gry stołu z zakończonych wywołań run()
+        self._running_since: Dict[int, float] = {}
+        self._next_id = 0
+        self._wall = 0.0  # czas zakończonych wywołań run()
+        self._start: Optional[float] = None
+
+    def add_table(self) -> int:
+        table_id = self._next_id
+        self._next_id += 1
+        seed_seq = self._seed_seq.spawn(1)[0]
+        self._table_seeds[table_id] = seed_seq
+        self._caches[table_id] = EquityCache()
+        players = simulation.make_bot_players(self.players_per_table, self.chips, seed_seq, self._caches[table_id])
+        self.observers[table_id] = self.observers_factory(table_id) if self.observers_factory else ()
+        self.tables[table_id] = AsyncTable(players, self.decision_timeout, self.observers[table_id],
+                                           dealer=Dealer.from_seed_sequence(seed_seq.spawn(1)[0]),
+                                           blocking=self.blocking)
+        self.sessions[table_id] = 1
+        self._elapsed[table_id] = 0.0
+        return table_id
+
+    def add_tables(self, count: int) -> List[int]:
+        return [self.add_table() for _ in range(count)]
+
+    def remove_table(self, table_id: int) -> None:
+        del self.tables[table_id]
+        del self._table_seeds[table_id]
+        del self._caches[table_id]
+        del self.observers[table_id]
+        del self.sessions[table_id]
+        del self._elapsed[table_id]
+        self._running_since.pop(table_id, None)
+
+    # gramy sesjami jak simulation.run_simulation: gdy zostanie jeden gracz z żetonami, nowe stacki.
+    # num_hands rozdań w tym wywołaniu - kolejne run() gra dalej na tych samych stołach
+    async def _run_table(self, table_id: int, num_hands: int) -> None:
+        table = self.tables[table_id]
+        target = table.hands + num_hands
+        self._running_since[table_id] = time.perf_counter()
+        try:
+            while table.hands < target and table_id in self.tables:
+                if len([p for p in table.players if p.chips > 0]) < 2:
+                    table.reset_players(simulation.make_bot_players(self.players_per_table, self.chips,
+                                                                    self._table_seeds[table_id],
+                                                                    self._caches[table_id]))
+                    self.sessions[table_id] += 1
+                await table.play_hand()
+        finally:
+            since = self._running_since.pop(table_id, None)
+            if since is not None and table_id in self._elapsed:
+                self._elapsed[table_id] += time.perf_counter() - since
+
+    async def run(self, hands_per_table: int) -> None:
+        self._start = time.perf_counter()
+        try:
+            await asyncio.gather(*(self._run_table(table_id, hands_per_table) for table_id in list(self.tables)))
+        finally:
+            self._wall += time.perf_counter() - self._start
+            self._start = None
+
+    def run_sync(self, hands_per_table: int) -> None:
+        asyncio.run(self.run(hands_per_table))
+
+    # łączny czas gry wszystkich wywołań run()
+    @property
+    def seconds(self) -> float:
+        return self._wall + (time.perf_counter() - self._start if self._start is not None else 0.0)
+
+    def table_seconds(self, table_id: int) -> float:
+        since = self._running_since.get(table_id)
+        return self._elapsed[table_id] + (time.perf_counter() - since if since is not None else 0.0)
+
+    # statystyki można czytać także w trakcie gry (np. z innego zadania w tej samej pętli)
+    def table_stats(self) -> List[TableStats]:
+        return [TableStats(table_id, t.hands, self.sessions[table_id], t.decisions, t.showdowns, t.timeouts,
+                           self.table_seconds(table_id), t.decision_seconds)
+                for table_id, t in self.tables.items()]
+
+    def aggregate_stats(self) -> TableStats:
+        total = TableStats(table_id=-1, seconds=self.seconds)
+        for s in self.table_stats():
+            total.hands += s.hands
+            total.sessions += s.sessions
+            total.decisions += s.decisions
+            total.showdowns += s.showdowns
+            total.timeouts += s.timeouts
+            total.decision_seconds += s.decision_seconds
+        return total
+
+def main():
+    parser = argparse.ArgumentParser(description="Wiele stołów botów w jednym procesie")
+    parser.add_argument("--tables", type=int, default=100)
+    parser.add_argument("--players", type=int, default=6)
+    parser.add_argument("--chips", type=int, default=1000)
+    parser.add_argument("--hands", type=int, default=20, help="rozdań na stół")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="limit czasu na decyzję (s)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--threads", action="store_true", help="boty w wątku stołu, z limitem czasu na decyzję")
+    parser.add_argument("--stats", default=None, help="plik JSON na statystyki ze wszystkich stołów")
+    args = parser.parse_args()
+
+    factory = (lambda table_id: (HandStats(),)) if args.stats else None
+    manager = TableManager(args.players, args.chips, args.seed, args.timeout, factory, blocking=args.threads)
+    manager.add_tables(args.tables)
+    manager.run_sync(args.hands)
+
+    total = manager.aggregate_stats()
+    per_table = sorted(manager.table_stats(), key=lambda s: s.hands_per_second)
+    print(f"Stoły: {len(per_table)}, rozdania: {total.hands}, decyzje: {total.decisions}, czas: {total.seconds:.2f} s")
+    print(f"Rozdań na sekundę: {total.hands_per_second:.1f} (na stół od {per_table[0].hands_per_second:.2f} "
+          f"do {per_table[-1].hands_per_second:.2f})")
+    print(f"Czas decyzji: {total.decision_seconds:.2f} s (na stół od {per_table[0].decision_seconds:.2f} "
+          f"do {per_table[-1].decision_seconds:.2f} s)")
+    print(f"Showdowny: {total.showdowns}, sesje: {total.sessions}, przekroczone limity czasu: {total.timeouts}")
+    if args.stats:
+        stats = HandStats()
+        for (table_stats,) in manager.observers.values():
+            stats.merge(table_stats)
+        stats.save(args.stats)
+        print(stats.summary_text())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import asyncio
+import time
+import numpy as np
+from async_table import AsyncTable
+from controllers import SmartBotController
+from dealer import Dealer
+from poker_equity import EquityCache
+import simulation
+
+# bot, który zawsze przekracza limit czasu, ale po nim i tak liczy decyzję do końca
+# (zużywa generator i cache jak zwykły bot)
+class SlowBot:
+    def __init__(self, bot: SmartBotController, delay: float):
+        self.bot = bot
+        self.delay = delay
+
+    def decide_action(self, player, state, legal_actions):
+        time.sleep(self.delay)
+        return self.bot.decide_action(player, state, legal_actions)
+
+# limit czasu z dużym zapasem dla zwykłych botów, przekracza go tylko SlowBot.
+# rozgrzewka, bo tablice ewaluatora budują się przy pierwszym użyciu i pierwsza decyzja trwa dłużej
+def play(seed: int, hands: int):
+    simulation.run_simulation(3, 4, seed=0)
+    seed_seq = np.random.SeedSequence(seed)
+    cache = EquityCache()
+    players = simulation.make_bot_players(4, seed_seq=seed_seq, cache=cache)
+    players[0] = players[0].__class__(name=players[0].name, chips=players[0].chips, hand=(),
+                                      controller=SlowBot(players[0].controller, 0.4))
+    table = AsyncTable(players, decision_timeout=0.2, dealer=Dealer.from_seed_sequence(seed_seq.spawn(1)[0]),
+                       blocking=True)
+    for _ in range(hands):
+        asyncio.run(table.play_hand())
+    return [p.chips for p in table.players], table.timeouts
+
+def test_timeouts_keep_seeded_run_deterministic():
+    first, timeouts = play(11, 4)
+    second, _ = play(11, 4)
+    assert timeouts > 0
+    assert first == second
+    assert sum(first) == 4 * 1000
+
+def test_inline_is_default_and_ignores_timeout():
+    players = simulation.make_bot_players(3, seed_seq=np.random.SeedSequence(1))
+    table = AsyncTable(players, decision_timeout=1e-9)
+    asyncio.run(table.play_hand())
+    assert table.executor is None
+    assert table.timeouts == 0
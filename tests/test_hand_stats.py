@@ -0,0 +1,19 @@
+import json
+import pytest
+from hand_stats import HandStats
+import simulation
+
+@pytest.mark.parametrize("every", [0, -5])
+def test_snapshot_every_must_be_positive(every):
+    with pytest.raises(ValueError):
+        HandStats(snapshot_every=every)
+
+def test_periodic_snapshot_and_zero_sum(tmp_path):
+    path = str(tmp_path / "stats.json")
+    stats = HandStats(snapshot_path=path, snapshot_every=10)
+    simulation.run_simulation(25, 4, seed=2, observers=(stats,))
+    with open(path) as f:
+        assert json.load(f)["hands"] == 20
+    # żetony się nie tworzą ani nie giną - suma wyników w bb po wszystkich graczach to zero
+    total = sum(s.result_bb.mean * s.result_bb.n for s in stats.seats.values())
+    assert total == pytest.approx(0.0, abs=1e-6)
@@ -0,0 +1,9 @@
+from simulation_farm import run_farm
+
+def outcome(workers: int):
+    total = run_farm(128, seed=3, workers=workers).total
+    return total.hands, total.sessions, total.showdowns, total.chip_deltas, total.showdowns_won
+
+# domyślny podział na części nie zależy od liczby procesów
+def test_result_independent_of_worker_count():
+    assert outcome(1) == outcome(2)